@@ -52,7 +52,7 @@ ROOT_URLCONF = "inform_agency.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "newspapers.timing.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -114,6 +114,9 @@ STATICFILES_DIRS = [
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "newspapers.Redactor"
 
+# Sessions resolve their user from the cache (newspapers.object_cache)
+AUTHENTICATION_BACKENDS = ["newspapers.auth.CachedModelBackend"]
+
 LOGIN_REDIRECT_URL = "/"
 
 
@@ -126,3 +129,138 @@ INTERNAL_IPS = [
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 
 CRISPY_TEMPLATE_PACK = "bootstrap5"
+
+# Cursor (keyset) pagination for list views: upper bound for ?page_size=
+CURSOR_PAGINATION_MAX_PAGE_SIZE = 100
+
+# Page-number pagination reports planner estimates above this many rows and
+# caches counts per query for ESTIMATED_COUNT_CACHE_TIMEOUT seconds
+ESTIMATED_COUNT_THRESHOLD = 10000
+ESTIMATED_COUNT_CACHE_TIMEOUT = 30
+
+# Postgres only: partition size ("month" or "year") used by the
+# partition_newspapers command, which range-partitions newspapers by
+# published_date; create_newspaper_partitions keeps NEWSPAPER_PARTITIONS_AHEAD
+# future partitions. SQLite always keeps a plain table.
+NEWSPAPER_PARTITIONING = os.environ.get("NEWSPAPER_PARTITIONING") or None
+NEWSPAPER_PARTITIONS_AHEAD = 3
+
+# Topic/Redactor substring search on SQLite scans at most this many matches
+SUBSTRING_SEARCH_FALLBACK_LIMIT = 1000
+
+# Cache backend for every alias in CACHES. CACHE_BACKEND is "locmem" (one
+# cache per process), "file" (CACHE_LOCATION is a directory shared by the
+# processes of one host, but add() and incr() are not atomic across them),
+# "redis" (CACHE_LOCATION is redis://host:port/db) or "memcached"
+# (CACHE_LOCATION is host:port).
+# Bump CACHE_VERSION to orphan every key written by an older deploy.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+}
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND") or "locmem"
+CACHE_LOCATION = os.environ.get("CACHE_LOCATION", "")
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "inform_agency")
+CACHE_VERSION = int(os.environ.get("CACHE_VERSION", "1"))
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": CACHE_LOCATION,
+        "KEY_PREFIX": CACHE_KEY_PREFIX,
+        "VERSION": CACHE_VERSION,
+        "TIMEOUT": 300,
+    },
+}
+
+# locmem and file caches hold at most CACHE_MAX_ENTRIES keys and drop
+# 1/CACHE_CULL_FREQUENCY of them when full; Django's default of 300 keys
+# would cull sessions and cached objects all the time. Redis and Memcached
+# evict by their own memory limit and take no such options.
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "20000"))
+CACHE_CULL_FREQUENCY = int(os.environ.get("CACHE_CULL_FREQUENCY", "10"))
+if CACHE_BACKEND in ("locmem", "file"):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": CACHE_MAX_ENTRIES,
+        "CULL_FREQUENCY": CACHE_CULL_FREQUENCY,
+    }
+
+# Tests run with empty caches (newspapers.test_runner).
+TEST_RUNNER = "newspapers.test_runner.CacheClearingDiscoverRunner"
+
+# Sessions are read from the cache and only written through to the database
+# when they change; the home page visit counter flushes to the session every
+# VISIT_COUNTER_FLUSH_EVERY visits instead of on every page view.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+VISIT_COUNTER_FLUSH_EVERY = 10
+
+# N+1 query detection (newspapers.middleware.NPlusOneDetectionMiddleware)
+NPLUSONE_ENABLED = os.environ.get("NPLUSONE_ENABLED", "") == "True"
+NPLUSONE_SAMPLE_RATE = float(os.environ.get("NPLUSONE_SAMPLE_RATE", "0.01"))
+NPLUSONE_THRESHOLD = 5
+NPLUSONE_RAISE = False
+
+# Server-Timing header and per-request timing log line
+# (newspapers.middleware.ServerTimingMiddleware); off unless enabled.
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "False") == "True"
+
+# Prometheus metrics (newspapers.middleware.PrometheusMetricsMiddleware, /metrics).
+# Set PROMETHEUS_MULTIPROC_DIR to aggregate samples across gunicorn workers.
+# /metrics is served to staff users and to the comma-separated addresses in
+# METRICS_ALLOWED_IPS (e.g. the Prometheus server), everyone else gets 403.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True") == "True"
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+METRICS_ALLOWED_IPS = [
+    ip.strip()
+    for ip in os.environ.get("METRICS_ALLOWED_IPS", "").split(",")
+    if ip.strip()
+]
+
+# Slow-query log for the default connection (newspapers.slow_queries).
+# Set SLOW_QUERY_THRESHOLD_MS to "off" (or leave it empty) to disable it.
+SLOW_QUERY_THRESHOLD_MS = os.environ.get("SLOW_QUERY_THRESHOLD_MS", "500").strip()
+SLOW_QUERY_THRESHOLD_MS = (
+    None
+    if SLOW_QUERY_THRESHOLD_MS.lower() in ("", "off")
+    else int(SLOW_QUERY_THRESHOLD_MS)
+)
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_LOG_FILE = os.environ.get(
+    "SLOW_QUERY_LOG_FILE", str(BASE_DIR / "slow_queries.log")
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+        # Reopened when moved, so several workers can share the file and
+        # leave rotation to logrotate.
+        "slow_queries": {
+            "class": "logging.handlers.WatchedFileHandler",
+            "filename": SLOW_QUERY_LOG_FILE,
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "newspapers.timing": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "newspapers.nplusone": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+        "newspapers.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -12,9 +14,12 @@ if RENDER_EXTERNAL_HOSTNAME:
 
 
 MIDDLEWARE = [
+    "newspapers.middleware.ServerTimingMiddleware",
+    "newspapers.middleware.PrometheusMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "newspapers.middleware.NPlusOneDetectionMiddleware",
+    "newspapers.middleware.SlowQueryContextMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -23,6 +28,30 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# debug_toolbar stays installed for development but never runs in production.
+SILENCED_SYSTEM_CHECKS = ["debug_toolbar.W001"]
+
+
+# Gunicorn workers share Redis, or Memcached with CACHE_BACKEND=memcached;
+# CACHE_LOCATION defaults to a server on this host. locmem and file caches
+# are refused: locmem is per process, and neither makes add() and incr()
+# atomic across processes, which the cache locks and the visit counter
+# rely on.
+DEFAULT_CACHE_LOCATIONS = {
+    "redis": "redis://127.0.0.1:6379/0",
+    "memcached": "127.0.0.1:11211",
+}
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND") or "redis"
+if CACHE_BACKEND not in DEFAULT_CACHE_LOCATIONS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND={CACHE_BACKEND} is not safe to share between workers; "
+        "use redis or memcached in production"
+    )
+CACHES["default"]["BACKEND"] = CACHE_BACKENDS[CACHE_BACKEND]
+CACHES["default"]["LOCATION"] = CACHE_LOCATION or DEFAULT_CACHE_LOCATIONS[CACHE_BACKEND]
+# MAX_ENTRIES and CULL_FREQUENCY only apply to locmem and file caches.
+CACHES["default"].pop("OPTIONS", None)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
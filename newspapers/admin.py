@@ -1,16 +1,59 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin
 
+from newspapers import topics
 from newspapers.models import Newspaper, Topic, Redactor
+from newspapers.pagination import EstimatedCountPaginator
+from newspapers.search import search_newspapers, search_substring
+
+
+class ProjectedChangeList(ChangeList):
+    """
+    Changelist that only loads the columns listed in the model admin's
+    ``changelist_fields``
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.only(*self.model_admin.changelist_fields)
+
+
+class ProjectedChangeListMixin:
+    changelist_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ProjectedChangeList
+
+
+class TopicListFilter(admin.SimpleListFilter):
+    """
+    ``list_filter`` on topic with the options read from the topic registry
+    """
+
+    title = "topic"
+    parameter_name = "topic__id__exact"
+
+    def lookups(self, request, model_admin):
+        return topics.get_registry().choices
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(topic_id=self.value())
+        return queryset
 
 
 @admin.register(Topic)
 class TopicAdmin(admin.ModelAdmin):
     list_display = ("name",)
+    search_fields = ("name",)
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_substring(queryset, "name", search_term), False
 
 
 @admin.register(Redactor)
-class RedactorAdmin(UserAdmin):
+class RedactorAdmin(ProjectedChangeListMixin, UserAdmin):
     list_display = UserAdmin.list_display + ("years_of_experience",)
     fieldsets = UserAdmin.fieldsets + (
         ("Additional info", {"fields": ("years_of_experience",)}),
@@ -29,11 +72,42 @@ class RedactorAdmin(UserAdmin):
     )
     search_fields = ("username",)
     ordering = ("username",)
+    changelist_fields = (
+        "id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "is_staff",
+        "years_of_experience",
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_substring(queryset, "username", search_term), False
 
 
 @admin.register(Newspaper)
-class NewspaperAdmin(admin.ModelAdmin):
-    list_display = ("title", "content", "published_date", "topic")
+class NewspaperAdmin(ProjectedChangeListMixin, admin.ModelAdmin):
+    list_display = ("title", "excerpt", "word_count", "published_date", "topic")
     search_fields = ("title",)
-    ordering = ("published_date",)
-    list_filter = ("topic",)
+    ordering = ("published_date", "id")
+    list_filter = (TopicListFilter,)
+    list_select_related = ("topic",)
+    autocomplete_fields = ("topic", "publishers")
+    changelist_fields = (
+        "id",
+        "title",
+        "excerpt",
+        "word_count",
+        "published_date",
+        "topic__name",
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_newspapers(queryset, search_term), False
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "newspapers"
+
+    def ready(self):
+        from django.conf import settings
+
+        from newspapers import metrics, slow_queries
+        from newspapers.signals import connect_signals
+
+        connect_signals()
+        slow_queries.install()
+        if getattr(settings, "METRICS_ENABLED", True) and metrics.is_available():
+            metrics.install_cache_metrics()
@@ -0,0 +1,52 @@
+from itertools import groupby
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+MONTH_COUNTS_CACHE_KEY = "newspapers:archive:month_counts"
+DEFAULT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def _compute_month_counts():
+    Newspaper = apps.get_model("newspapers", "Newspaper")
+    return list(
+        Newspaper.objects.annotate(month=TruncMonth("published_date"))
+        .values("month")
+        .annotate(count=Count("id"))
+        .order_by("-month")
+    )
+
+
+def get_month_counts():
+    """
+    Number of newspapers per publication month, newest month first, from
+    one grouped query cached until a newspaper is saved or deleted
+    """
+    counts = cache.get(MONTH_COUNTS_CACHE_KEY)
+    if counts is None:
+        counts = _compute_month_counts()
+        cache.set(
+            MONTH_COUNTS_CACHE_KEY,
+            counts,
+            getattr(settings, "ARCHIVE_COUNTS_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT),
+        )
+    return counts
+
+
+def get_months_by_year():
+    """
+    ``get_month_counts()`` grouped into ``(year, months, total)`` for the
+    archive sidebar
+    """
+    years = []
+    for year, months in groupby(get_month_counts(), key=lambda e: e["month"].year):
+        months = list(months)
+        years.append((year, months, sum(entry["count"] for entry in months)))
+    return years
+
+
+def invalidate():
+    cache.delete(MONTH_COUNTS_CACHE_KEY)
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from newspapers import object_cache
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` that resolves the user of an authenticated session from
+    the object cache instead of a users-table query per request.
+
+    Entries are dropped when the user is saved (profile edits, password
+    changes, logins), deleted or logs out. Writes that bypass ``save()``,
+    such as ``QuerySet.update()``, must call
+    ``object_cache.invalidate_users()`` themselves.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = object_cache.get_user(user_id)
+        except get_user_model().DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,97 @@
+"""
+The one instrumentation layer over cache backend classes.
+
+``get``/``get_many`` and the write methods of each installed backend class
+are wrapped once; the wrappers report to every registered listener, so
+Server-Timing (``newspapers.timing``) and Prometheus (``newspapers.metrics``)
+share the same patch instead of stacking their own.
+"""
+
+import functools
+
+from django.core.cache.backends.base import BaseCache
+
+WRITES = ("set", "add", "delete", "touch", "incr", "set_many", "delete_many")
+_MISSING = object()
+
+# Called as listener(backend, hits, misses) and listener(backend, operation).
+_read_listeners = []
+_write_listeners = []
+
+
+def add_read_listener(listener):
+    if listener not in _read_listeners:
+        _read_listeners.append(listener)
+
+
+def add_write_listener(listener):
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def _reads(backend, hits, misses):
+    for listener in _read_listeners:
+        listener(backend, hits, misses)
+
+
+def _hooked_get(get):
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        value = get(self, key, _MISSING, version=version)
+        if value is _MISSING:
+            _reads(self, 0, 1)
+            return default
+        _reads(self, 1, 0)
+        return value
+
+    wrapper.newspapers_hooked = True
+    return wrapper
+
+
+def _hooked_get_many(get_many):
+    @functools.wraps(get_many)
+    def wrapper(self, keys, version=None):
+        keys = list(keys)
+        values = get_many(self, keys, version=version)
+        _reads(self, len(values), len(keys) - len(values))
+        return values
+
+    wrapper.newspapers_hooked = True
+    return wrapper
+
+
+def _hooked_write(method, operation):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        for listener in _write_listeners:
+            listener(self, operation)
+        return method(self, *args, **kwargs)
+
+    wrapper.newspapers_hooked = True
+    return wrapper
+
+
+def _hook(cls, name, decorator):
+    method = getattr(cls, name)
+    # BaseCache implements the *_many methods as loops over the single key
+    # ones, which are already hooked.
+    if name.endswith("_many") and method is getattr(BaseCache, name):
+        return
+    if not getattr(method, "newspapers_hooked", False):
+        setattr(cls, name, decorator(method))
+
+
+def install(cache_backends):
+    """
+    Hook reads and writes of the given backend classes. Safe to call more
+    than once.
+    """
+    for backend in cache_backends:
+        _hook(backend, "get", _hooked_get)
+        _hook(backend, "get_many", _hooked_get_many)
+        for operation in WRITES:
+            _hook(
+                backend,
+                operation,
+                functools.partial(_hooked_write, operation=operation),
+            )
@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.conf import settings
+from django.db.models import F
+
+COUNTED_MODELS = ("newspapers.Topic", settings.AUTH_USER_MODEL, "newspapers.Newspaper")
+
+
+def get_counted_models():
+    return [apps.get_model(label) for label in COUNTED_MODELS]
+
+
+def counter_name(model):
+    return model._meta.label_lower
+
+
+def _counter_model():
+    return apps.get_model("newspapers", "Counter")
+
+
+def reconcile(models=None, using="default"):
+    """
+    Recompute the exact row count of ``models`` and store it in the counters table
+    """
+    Counter = _counter_model()
+    counts = {}
+    for model in models or get_counted_models():
+        value = model._default_manager.using(using).count()
+        Counter.objects.using(using).update_or_create(
+            name=counter_name(model), defaults={"value": value}
+        )
+        counts[model] = value
+    return counts
+
+
+def increment(model, delta=1, using="default"):
+    """
+    Adjust the counter of ``model`` by ``delta``; call it after bulk writes
+    that bypass ``post_save``/``post_delete`` (e.g. ``bulk_create``).
+    """
+    if not delta:
+        return
+    updated = (
+        _counter_model()
+        .objects.using(using)
+        .filter(name=counter_name(model))
+        .update(value=F("value") + delta)
+    )
+    if not updated:
+        reconcile([model], using=using)
+
+
+def get_counts(models=None, using="default"):
+    """
+    Read the counters of ``models`` in one query, keyed by model class
+    """
+    models = models or get_counted_models()
+    names = {counter_name(model): model for model in models}
+    rows = (
+        _counter_model()
+        .objects.using(using)
+        .filter(name__in=names)
+        .values_list("name", "value")
+    )
+    counts = {names[name]: value for name, value in rows}
+    missing = [model for model in models if model not in counts]
+    if missing:
+        counts.update(reconcile(missing, using=using))
+    return counts
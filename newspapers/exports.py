@@ -0,0 +1,75 @@
+import csv
+import json
+
+from django.db.models import Prefetch
+
+from newspapers.forms import NewspaperSearchForm
+from newspapers.models import Newspaper, Redactor
+
+EXPORT_FIELDS = ("id", "title", "content", "published_date", "topic", "publishers")
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    File-like object for csv.writer that hands each line back instead of
+    buffering it
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_queryset(params):
+    """
+    Newspapers matching the same ``topic``/``q`` filters as NewspaperListView
+    """
+    queryset = (
+        Newspaper.objects.select_related("topic")
+        .prefetch_related(
+            Prefetch("publishers", queryset=Redactor.objects.only("id", "username"))
+        )
+        .order_by("id")
+    )
+    form = NewspaperSearchForm(params)
+    if form.is_valid():
+        return form.get_queryset(queryset)
+    return queryset
+
+
+def iter_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    for newspaper in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "id": newspaper.id,
+            "title": newspaper.title,
+            "content": newspaper.content,
+            "published_date": newspaper.published_date.isoformat(),
+            "topic": newspaper.topic.name if newspaper.topic else None,
+            "publishers": [
+                publisher.username for publisher in newspaper.publishers.all()
+            ],
+        }
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row["publishers"] = ";".join(row["publishers"])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_export(queryset, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    rows = iter_rows(queryset, chunk_size=chunk_size)
+    if export_format == "csv":
+        return iter_csv(rows)
+    return iter_ndjson(rows)
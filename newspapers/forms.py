@@ -1,11 +1,15 @@
 from crispy_bootstrap5.bootstrap5 import FloatingField
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.core.exceptions import ValidationError
 from django import forms
+from django.urls import reverse_lazy
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit
 
+from newspapers import topics
 from newspapers.models import Redactor, Newspaper, Topic
+from newspapers.search import search_newspapers, search_substring
 
 
 class RedactorCreationForm(UserCreationForm):
@@ -52,6 +56,93 @@ class RedactorSearchForm(forms.Form):
         ),
     )
 
+    def get_queryset(self, queryset=None):
+        if queryset is None:
+            queryset = Redactor.objects.all()
+        return search_substring(queryset, "username", self.cleaned_data.get("username"))
+
+
+PUBLISHER_FIELDS = ("id", "username", "first_name", "last_name")
+
+
+class AutocompleteSelectMultiple(forms.SelectMultiple):
+    """
+    Multiple select that renders only the selected options; the rest are
+    searched through the JSON endpoint at ``url`` by
+    ``js/autocomplete.js``.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        selected = set()
+        for pk in value:
+            try:
+                selected.add(choices.queryset.model._meta.pk.to_python(pk))
+            except ValidationError:
+                # Redisplaying a submission with bogus ids.
+                continue
+        selected.discard(None)
+        if not selected:
+            return []
+        options = []
+        for index, obj in enumerate(choices.queryset.filter(pk__in=selected)):
+            option_value, label = choices.choice(obj)
+            options.append(
+                self.create_option(name, option_value, label, True, index, attrs=attrs)
+            )
+        return [(None, options, 0)]
+
+    class Media:
+        js = ("js/autocomplete.js",)
+
+
+class TopicChoiceIterator(forms.models.ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from topics.get_registry().choices
+
+    def __len__(self):
+        return len(topics.get_registry()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(topics.get_registry())
+
+
+class TopicChoiceField(forms.ModelChoiceField):
+    """
+    Topic select whose choices and validation come from the topic registry
+    instead of the database
+    """
+
+    iterator = TopicChoiceIterator
+
+    def __init__(self, queryset=None, **kwargs):
+        if queryset is None:
+            queryset = Topic.objects.all()
+        super().__init__(queryset=queryset, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Topic):
+            return value
+        try:
+            topic = topics.get_registry().get(int(value))
+        except (TypeError, ValueError):
+            topic = None
+        # Unknown ids are looked up, and rejected, by the database.
+        return topic or super().to_python(value)
+
 
 class NewspaperForm(forms.ModelForm):
     """
@@ -59,14 +150,18 @@ class NewspaperForm(forms.ModelForm):
     """
 
     publishers = forms.ModelMultipleChoiceField(
-        queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple(attrs={"class": "form-check"}),
+        queryset=get_user_model().objects.only(*PUBLISHER_FIELDS),
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy("newspapers:redactor-autocomplete"),
+            attrs={"class": "form-control"},
+        ),
         required=False,
     )
 
     class Meta:
         model = Newspaper
         fields = "__all__"
+        field_classes = {"topic": TopicChoiceField}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -82,7 +177,7 @@ class NewspaperForm(forms.ModelForm):
 
 class NewspaperSearchForm(forms.Form):
     """
-    Search for newspaper by topic
+    Search for newspaper by topic and full-text search over title and content
     """
 
     topic = forms.CharField(
@@ -96,13 +191,28 @@ class NewspaperSearchForm(forms.Form):
             }
         ),
     )
+    q = forms.CharField(
+        max_length=255,
+        required=False,
+        label="",
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Search in title and content",
+                "class": "form-control",
+            }
+        ),
+    )
 
-    def get_queryset(self):
-        queryset = Newspaper.objects.all()
+    def get_queryset(self, queryset=None):
+        if queryset is None:
+            queryset = Newspaper.objects.all()
         topic = self.cleaned_data.get("topic")
         if topic:
-            queryset = queryset.filter(topic__name__icontains=topic)
-        return queryset
+            # Matching topic ids first lets the topic_id index drive the scan.
+            queryset = queryset.filter(
+                topic__in=Topic.objects.filter(name__icontains=topic).values("pk")
+            )
+        return search_newspapers(queryset, self.cleaned_data.get("q"))
 
 
 class TopicSearchForm(forms.Form):
@@ -122,9 +232,7 @@ class TopicSearchForm(forms.Form):
         ),
     )
 
-    def get_queryset(self):
-        queryset = Topic.objects.all()
-        topic = self.cleaned_data.get("name")
-        if topic:
-            queryset = queryset.filter(name__icontains=self.cleaned_data.get("name"))
-        return queryset
+    def get_queryset(self, queryset=None):
+        if queryset is None:
+            queryset = Topic.objects.all()
+        return search_substring(queryset, "name", self.cleaned_data.get("name"))
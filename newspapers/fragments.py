@@ -0,0 +1,144 @@
+"""
+Cached HTML of list rows, shared by every user and page that shows them.
+
+A row is cached under its object id plus the versions of the surrogate
+keys it depends on: the object itself and the objects rendered inside it
+(a newspaper row shows its topic and publishers). Purging a surrogate key
+replaces its version, so every row that showed that object is rendered
+again on its next request while the rest stay cached.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+SURROGATE_CACHE_KEY = "newspapers:surrogate:{key}"
+FRAGMENT_CACHE_KEY = "newspapers:fragment:{template}:{key}:{digest}"
+DEFAULT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def _timeout():
+    return getattr(settings, "FRAGMENT_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def surrogate_key(obj):
+    return f"{obj._meta.label_lower}:{obj.pk}"
+
+
+def surrogate_keys(model, pks):
+    return [f"{model._meta.label_lower}:{pk}" for pk in pks]
+
+
+def _publisher_ids(newspapers):
+    """
+    Publisher ids per newspaper pk, from prefetched publishers when every
+    newspaper has them and from one query on the through table otherwise
+    """
+    if all(
+        "publishers" in getattr(n, "_prefetched_objects_cache", {}) for n in newspapers
+    ):
+        return {n.pk: [p.pk for p in n.publishers.all()] for n in newspapers}
+    field = newspapers[0]._meta.get_field("publishers")
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+    publisher_ids = {n.pk: [] for n in newspapers}
+    rows = field.remote_field.through._default_manager.using(
+        newspapers[0]._state.db
+    ).filter(**{f"{source}__in": list(publisher_ids)})
+    for newspaper_id, publisher_id in rows.values_list(source, target):
+        publisher_ids[newspaper_id].append(publisher_id)
+    return publisher_ids
+
+
+def rows_surrogate_keys(objects):
+    """
+    Surrogate keys of each of ``objects`` and of the related objects its row
+    renders, with at most one query for all the rows
+    """
+    keys = [[surrogate_key(obj)] for obj in objects]
+    newspapers = [
+        obj for obj in objects if obj._meta.label_lower == "newspapers.newspaper"
+    ]
+    if not newspapers:
+        return keys
+    field = newspapers[0]._meta.get_field("publishers")
+    topic_model = newspapers[0]._meta.get_field("topic").related_model
+    publisher_ids = _publisher_ids(newspapers)
+    for obj, obj_keys in zip(objects, keys):
+        if obj._meta.label_lower != "newspapers.newspaper":
+            continue
+        if obj.topic_id is not None:
+            obj_keys.extend(surrogate_keys(topic_model, [obj.topic_id]))
+        obj_keys.extend(surrogate_keys(field.related_model, publisher_ids[obj.pk]))
+    return keys
+
+
+def get_versions(keys):
+    """
+    Current version of each surrogate key, creating the missing ones
+    """
+    cache_keys = {SURROGATE_CACHE_KEY.format(key=key): key for key in keys}
+    found = cache.get_many(cache_keys)
+    missing = {
+        cache_key: uuid.uuid4().hex
+        for cache_key in cache_keys
+        if cache_key not in found
+    }
+    if missing:
+        cache.set_many(missing, _timeout())
+        found.update(missing)
+    return {cache_keys[cache_key]: version for cache_key, version in found.items()}
+
+
+def purge(keys):
+    """
+    Invalidate every cached row that depends on one of ``keys``
+    """
+    if keys:
+        cache.delete_many([SURROGATE_CACHE_KEY.format(key=key) for key in keys])
+
+
+def fragment_key(template_name, obj, keys, versions):
+    digest = hashlib.md5(
+        ":".join(versions[key] for key in keys).encode(), usedforsecurity=False
+    ).hexdigest()
+    return FRAGMENT_CACHE_KEY.format(
+        template=template_name, key=surrogate_key(obj), digest=digest
+    )
+
+
+def render_rows(template_name, objects, name, current=None):
+    """
+    HTML of ``template_name`` rendered for each of ``objects`` as ``name``,
+    reusing cached rows and rendering only the missing ones, with two
+    cache reads per list.
+
+    The row equal to ``current`` (e.g. the logged-in redactor) is rendered
+    with ``is_current`` set and never cached.
+    """
+    objects = list(objects)
+    row_keys = rows_surrogate_keys(objects)
+    versions = get_versions({key for keys in row_keys for key in keys})
+    fragment_keys = [
+        fragment_key(template_name, obj, keys, versions)
+        for obj, keys in zip(objects, row_keys)
+    ]
+    cached = cache.get_many(fragment_keys)
+    rendered = {}
+    rows = []
+    for obj, key in zip(objects, fragment_keys):
+        is_current = current is not None and obj == current
+        html = None if is_current else cached.get(key)
+        if html is None:
+            html = render_to_string(
+                template_name, {name: obj, "is_current": is_current}
+            )
+            if not is_current:
+                rendered[key] = html
+        rows.append(html)
+    if rendered:
+        cache.set_many(rendered, _timeout())
+    return rows
@@ -0,0 +1,235 @@
+import codecs
+import io
+import json
+import time
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.color import no_style
+from django.core.serializers import python
+from django.db import connections, transaction
+
+from newspapers import archive, counters, object_cache, topics
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Models in foreign key dependency order: a batch is always flushed after
+# the batches it may reference.
+IMPORTED_MODELS = ("newspapers.Topic", settings.AUTH_USER_MODEL, "newspapers.Newspaper")
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(head):
+    """
+    Guess the encoding of a JSON document from its first bytes
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    # JSON starts with an ASCII character, so UTF-16 shows up as a null byte.
+    if len(head) >= 2 and head[0] == 0 and head[1] != 0:
+        return "utf-16-be"
+    if len(head) >= 2 and head[0] != 0 and head[1] == 0:
+        return "utf-16-le"
+    return "utf-8"
+
+
+def open_text(binary, encoding=None):
+    if encoding is None:
+        encoding = detect_encoding(binary.peek(4)[:4])
+    return io.TextIOWrapper(binary, encoding=encoding)
+
+
+def iter_json_objects(stream, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yield the objects of a JSON array or of newline-delimited JSON one at a
+    time, holding at most one object plus one read chunk in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if buffer[:1] in ("[", ","):
+            buffer = buffer[1:]
+            continue
+        if buffer[:1] == "]":
+            return
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield obj
+                buffer = buffer[end:]
+                continue
+        elif eof:
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+class NewspaperImporter:
+    """
+    Load Django fixture records for topics, redactors and newspapers with
+    ``bulk_create`` in batches of ``batch_size``, committing every
+    ``transaction_size`` records.
+    """
+
+    def __init__(
+        self,
+        using="default",
+        batch_size=1000,
+        transaction_size=10000,
+        ignore_conflicts=False,
+        progress=None,
+    ):
+        self.using = using
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+        self.ignore_conflicts = ignore_conflicts
+        self.progress = progress
+        self.models = [apps.get_model(label) for label in IMPORTED_MODELS]
+        publishers = apps.get_model("newspapers", "Newspaper")._meta.get_field(
+            "publishers"
+        )
+        self.newspaper_model = publishers.model
+        self.through = publishers.remote_field.through
+        self.through_source = f"{publishers.m2m_field_name()}_id"
+        self.through_target = f"{publishers.m2m_reverse_field_name()}_id"
+        self.buffers = {model: [] for model in self.models}
+        self.publishers = []
+        self.linked_publishers = set()
+        self.created = {model: 0 for model in [*self.models, self.through]}
+        self.skipped = 0
+
+    @property
+    def buffered(self):
+        return sum(len(buffer) for buffer in self.buffers.values())
+
+    def add(self, deserialized):
+        instance = deserialized.object
+        model = type(instance)
+        if model not in self.buffers:
+            self.skipped += 1
+            return
+        if self.ignore_conflicts and instance.pk is None:
+            # bulk_create(ignore_conflicts=True) does not set primary keys,
+            # so nothing could tell which rows were inserted.
+            raise ValueError(
+                f"{model._meta.label} record without a pk cannot be imported "
+                "with ignore_conflicts"
+            )
+        self.buffers[model].append(instance)
+        if model is self.newspaper_model:
+            # bulk_create() bypasses save(), which maintains the summary.
+            instance.update_summary()
+            publishers = deserialized.m2m_data.get("publishers")
+            if publishers:
+                self.publishers.append((instance, publishers))
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def _matching(self, model, objs):
+        manager = model._default_manager.using(self.using)
+        if model is self.through:
+            return manager.filter(
+                **{
+                    f"{self.through_source}__in": {
+                        getattr(obj, self.through_source) for obj in objs
+                    }
+                }
+            )
+        return manager.filter(pk__in=[obj.pk for obj in objs])
+
+    def bulk_create(self, model, objs):
+        """
+        Insert ``objs`` and return the pks of the ones actually inserted
+        (``None`` for through rows)
+        """
+        if not self.ignore_conflicts:
+            model._default_manager.using(self.using).bulk_create(
+                objs, batch_size=self.batch_size
+            )
+            self.created[model] += len(objs)
+            return None if model is self.through else {obj.pk for obj in objs}
+        # Conflicting rows are skipped silently, so what was inserted is
+        # read back from the database.
+        matching = self._matching(model, objs)
+        existing = set(matching.values_list("pk", flat=True))
+        model._default_manager.using(self.using).bulk_create(
+            objs, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        inserted = set(matching.values_list("pk", flat=True)) - existing
+        self.created[model] += len(inserted)
+        return None if model is self.through else inserted
+
+    def flush(self):
+        inserted_newspapers = set()
+        for model, buffer in self.buffers.items():
+            if buffer:
+                inserted = self.bulk_create(model, buffer)
+                if model is self.newspaper_model:
+                    inserted_newspapers = inserted
+                buffer.clear()
+        # Through rows are built after the newspapers are saved, so records
+        # without an explicit pk get the one assigned by the database.
+        # Publishers of skipped newspapers are not linked to the existing row.
+        through_rows = [
+            self.through(
+                **{self.through_source: newspaper.pk, self.through_target: publisher}
+            )
+            for newspaper, publishers in self.publishers
+            if newspaper.pk in inserted_newspapers
+            for publisher in publishers
+        ]
+        if through_rows:
+            self.bulk_create(self.through, through_rows)
+            self.linked_publishers.update(
+                getattr(row, self.through_target) for row in through_rows
+            )
+        self.publishers.clear()
+
+    def run(self, records):
+        objects = python.Deserializer(records, using=self.using, ignorenonexistent=True)
+        start = time.perf_counter()
+        total = 0
+        while True:
+            with transaction.atomic(using=self.using):
+                consumed = 0
+                for deserialized in islice(objects, self.transaction_size):
+                    self.add(deserialized)
+                    consumed += 1
+                self.flush()
+            if not consumed:
+                break
+            total += consumed
+            if self.progress:
+                elapsed = time.perf_counter() - start
+                self.progress(total, total / elapsed if elapsed else 0.0)
+        self.finish()
+        return total
+
+    def finish(self):
+        connection = connections[self.using]
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), self.models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        for model in self.models:
+            counters.increment(model, self.created[model], using=self.using)
+        # bulk_create() sends no post_save or m2m_changed signals.
+        archive.invalidate()
+        object_cache.invalidate_redactors(self.linked_publishers)
+        if self.created[apps.get_model("newspapers", "Topic")]:
+            topics.invalidate()
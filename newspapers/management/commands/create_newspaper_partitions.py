@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from newspapers import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create newspaper partitions from the current period up to --ahead "
+        "periods in advance. Requires NEWSPAPER_PARTITIONING on Postgres."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            help="Number of future months or years to create partitions for "
+            "(default: NEWSPAPER_PARTITIONS_AHEAD)",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        interval = partitions.get_interval()
+        if interval is None:
+            raise CommandError("NEWSPAPER_PARTITIONING is not set")
+        if not partitions.is_partitioned(connection):
+            raise CommandError(
+                f"{partitions.TABLE} is not partitioned on this database; "
+                "run partition_newspapers first"
+            )
+        created = partitions.create_future_partitions(
+            connection, interval, ahead=options["ahead"]
+        )
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        if not created:
+            self.stdout.write("All partitions already exist")
+        stray = partitions.default_partition_rows(connection)
+        if stray:
+            self.stderr.write(
+                f"{stray} rows are in {partitions.DEFAULT_PARTITION}; move them "
+                "before creating partitions for their periods"
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from newspapers import exports
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream newspapers with their topic and publisher usernames as CSV or "
+        "NDJSON, filtered like the newspaper list."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(exports.EXPORT_FORMATS), default="csv"
+        )
+        parser.add_argument("--topic", default="", help="Topic name contains")
+        parser.add_argument("--q", default="", help="Full-text search query")
+        parser.add_argument("--output", help="Write to this file instead of stdout")
+        parser.add_argument(
+            "--chunk-size", type=int, default=exports.DEFAULT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        queryset = exports.export_queryset(
+            {"topic": options["topic"], "q": options["q"]}
+        )
+        chunks = exports.iter_export(
+            queryset, options["format"], chunk_size=options["chunk_size"]
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as f:
+                f.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
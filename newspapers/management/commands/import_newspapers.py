@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from newspapers.importers import NewspaperImporter, iter_json_objects, open_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream topics, redactors and newspapers from a Django JSON fixture or "
+        "NDJSON file (UTF-8 or UTF-16, detected automatically) into the "
+        "database with batched bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fixture file, e.g. dump.json")
+        parser.add_argument("--encoding", help="Skip detection and use this encoding")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--transaction-size",
+            type=int,
+            default=10000,
+            help="Number of records committed per transaction",
+        )
+        parser.add_argument(
+            "--ignore-conflicts",
+            action="store_true",
+            help="Skip records whose primary key already exists; every record "
+            "must then have a pk",
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        importer = NewspaperImporter(
+            using=options["database"],
+            batch_size=options["batch_size"],
+            transaction_size=options["transaction_size"],
+            ignore_conflicts=options["ignore_conflicts"],
+            progress=self.report_progress,
+        )
+        with open(options["path"], "rb") as binary:
+            stream = open_text(binary, options["encoding"])
+            try:
+                total = importer.run(iter_json_objects(stream))
+            except ValueError as error:
+                raise CommandError(error)
+
+        for model, created in importer.created.items():
+            self.stdout.write(f"{model._meta.label}: {created}")
+        if importer.skipped:
+            self.stdout.write(f"Skipped records of other models: {importer.skipped}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {total} records"))
+
+    def report_progress(self, total, rate):
+        self.stdout.write(f"{total} records imported ({rate:.0f} rows/s)")
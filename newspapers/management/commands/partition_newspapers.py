@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from newspapers import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the newspapers table as one range-partitioned by "
+        "published_date, or as a plain table again with --revert. Postgres "
+        "only; the table is locked while its rows are copied."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            choices=partitions.INTERVALS,
+            help="Partition size (default: NEWSPAPER_PARTITIONING)",
+        )
+        parser.add_argument(
+            "--revert",
+            action="store_true",
+            help="Turn the partitioned table back into a plain one",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if not partitions.supports_partitioning(connection):
+            raise CommandError("Partitioning is only supported on Postgres")
+        partitioned = partitions.is_partitioned(connection)
+        if options["revert"]:
+            if not partitioned:
+                raise CommandError(f"{partitions.TABLE} is not partitioned")
+            with transaction.atomic(using=connection.alias):
+                partitions.unpartition_table(connection)
+            self.stdout.write(
+                self.style.SUCCESS(f"{partitions.TABLE} is a plain table again")
+            )
+            return
+        interval = options["interval"] or partitions.get_interval()
+        if interval is None:
+            raise CommandError("Pass --interval or set NEWSPAPER_PARTITIONING")
+        if partitioned:
+            raise CommandError(f"{partitions.TABLE} is already partitioned")
+        with transaction.atomic(using=connection.alias):
+            partitions.partition_table(connection, interval)
+        self.stdout.write(
+            self.style.SUCCESS(f"{partitions.TABLE} is partitioned by {interval}")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from newspapers import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard counters from exact COUNT(*) queries. "
+        "Run periodically (e.g. from cron) to correct drift from raw SQL writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        counts = counters.reconcile(using=options["database"])
+        for model, value in counts.items():
+            self.stdout.write(f"{counters.counter_name(model)}: {value}")
@@ -0,0 +1,150 @@
+"""
+Prometheus metrics for the site.
+
+With several gunicorn workers set ``PROMETHEUS_MULTIPROC_DIR`` to an empty,
+writable directory before the workers start: every process then writes its
+samples to mmap-ed files there and ``/metrics`` aggregates all of them.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.module_loading import import_string
+
+from newspapers import cache_hooks
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+UNRESOLVED_VIEW = "<unresolved>"
+UNKNOWN_CACHE = "<unknown>"
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "newspapers_request_latency_seconds",
+        "Request latency by URL name",
+        ["view", "method"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    DB_QUERIES = prometheus_client.Histogram(
+        "newspapers_request_db_queries",
+        "Database queries per request by URL name",
+        ["view"],
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        "newspapers_response_size_bytes",
+        "Response body size by URL name",
+        ["view"],
+        buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    )
+    REQUEST_ERRORS = prometheus_client.Counter(
+        "newspapers_request_errors_total",
+        "Responses with a 5xx status by URL name",
+        ["view", "status"],
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        "newspapers_cache_requests_total",
+        "Cache reads by CACHES alias and hit or miss",
+        ["alias", "result"],
+    )
+    CACHE_WRITES_TOTAL = prometheus_client.Counter(
+        "newspapers_cache_writes_total",
+        "Cache writes by CACHES alias and operation",
+        ["alias", "operation"],
+    )
+
+
+def is_available():
+    return prometheus_client is not None
+
+
+def metric_view_name(request):
+    # Unresolved paths are collapsed into one label to bound cardinality.
+    match = request.resolver_match
+    return match.view_name if match else UNRESOLVED_VIEW
+
+
+def observe_request(request, response, duration, db_queries):
+    view = metric_view_name(request)
+    REQUEST_LATENCY.labels(view, request.method).observe(duration)
+    DB_QUERIES.labels(view).observe(db_queries)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(view).observe(len(response.content))
+    if response.status_code >= 500:
+        REQUEST_ERRORS.labels(view, str(response.status_code)).inc()
+
+
+def cache_alias(backend):
+    """
+    ``CACHES`` alias of a backend instance; connections are per thread, so
+    the lookup runs once per instance
+    """
+    alias = getattr(backend, "newspapers_alias", None)
+    if alias is None:
+        alias = next(
+            (name for name in settings.CACHES if caches[name] is backend),
+            UNKNOWN_CACHE,
+        )
+        backend.newspapers_alias = alias
+    return alias
+
+
+def observe_cache_reads(backend, hits, misses):
+    alias = cache_alias(backend)
+    if hits:
+        CACHE_REQUESTS.labels(alias, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(alias, "miss").inc(misses)
+
+
+def observe_cache_write(backend, operation):
+    CACHE_WRITES_TOTAL.labels(cache_alias(backend), operation).inc()
+
+
+def install_cache_metrics():
+    """
+    Meter reads (hits/misses) and writes of every backend class in
+    ``CACHES``, labelled by alias. Safe to call more than once.
+    """
+    cache_hooks.install(
+        import_string(config["BACKEND"]) for config in settings.CACHES.values()
+    )
+    cache_hooks.add_read_listener(observe_cache_reads)
+    cache_hooks.add_write_listener(observe_cache_write)
+
+
+def get_registry():
+    if getattr(settings, "PROMETHEUS_MULTIPROC_DIR", None):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(
+            registry, path=settings.PROMETHEUS_MULTIPROC_DIR
+        )
+        return registry
+    return prometheus_client.REGISTRY
+
+
+def can_read_metrics(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    allowed_ips = getattr(settings, "METRICS_ALLOWED_IPS", [])
+    return request.META.get("REMOTE_ADDR") in allowed_ips
+
+
+def metrics_view(request):
+    """
+    Expose all metrics in the Prometheus text format to staff users and
+    to ``METRICS_ALLOWED_IPS``
+    """
+    if not can_read_metrics(request):
+        return HttpResponseForbidden()
+    if not is_available():
+        return HttpResponse("prometheus_client is not installed", status=501)
+    return HttpResponse(
+        prometheus_client.generate_latest(get_registry()),
+        content_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
@@ -0,0 +1,195 @@
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from newspapers import metrics, slow_queries, timing
+from newspapers.sql import fingerprint_sql, find_call_site
+
+logger = logging.getLogger("newspapers.nplusone")
+timing_logger = logging.getLogger("newspapers.timing")
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+class QueryShapeRecorder:
+    """
+    ``connection.execute_wrapper`` that counts queries per (shape, call site)
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.counts[(fingerprint_sql(sql), find_call_site(sys._getframe(1)))] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        return [
+            (sql, location, count)
+            for (sql, location), count in self.counts.items()
+            if count >= threshold
+        ]
+
+
+class NPlusOneDetectionMiddleware:
+    """
+    Detect N+1 queries: the same query shape issued repeatedly from one
+    template or code location during a single request.
+
+    Enabled with ``NPLUSONE_ENABLED``; only a ``NPLUSONE_SAMPLE_RATE``
+    fraction of requests is instrumented. Offenders are logged, or raised
+    as ``NPlusOneError`` when ``NPLUSONE_RAISE`` is set (for tests).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "NPLUSONE_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "NPLUSONE_SAMPLE_RATE", 1.0)
+        self.threshold = getattr(settings, "NPLUSONE_THRESHOLD", 5)
+        self.raise_errors = getattr(settings, "NPLUSONE_RAISE", False)
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryShapeRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        repeated = recorder.repeated(self.threshold)
+        if repeated:
+            self.report(request, repeated)
+        return response
+
+    def report(self, request, repeated):
+        view_name = resolved_view_name(request)
+        messages = [
+            f"{count} x {sql} at {location}" for sql, location, count in repeated
+        ]
+        message = f"N+1 queries in {view_name}: " + "; ".join(messages)
+        if self.raise_errors:
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+def resolved_view_name(request):
+    match = request.resolver_match
+    return match.view_name if match else request.path
+
+
+class ServerTimingMiddleware:
+    """
+    Emit a ``Server-Timing`` header and a structured log line per request
+    with DB time and query count, template render time, cache hits/misses
+    and total view time, keyed by the resolved URL name.
+
+    Disabled when ``SERVER_TIMING_ENABLED`` is false.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SERVER_TIMING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        timing.install(
+            import_string(config["BACKEND"]) for config in settings.CACHES.values()
+        )
+
+    def __call__(self, request):
+        timings, token = timing.start_request()
+        try:
+            with connection.execute_wrapper(timings):
+                response = self.get_response(request)
+        finally:
+            timing.end_request(token)
+
+        view_name = resolved_view_name(request)
+        response["Server-Timing"] = self.header(timings, view_name)
+        timing_logger.info(
+            json.dumps(
+                {
+                    "view": view_name,
+                    "method": request.method,
+                    "status": response.status_code,
+                    **timings.as_dict(),
+                }
+            )
+        )
+        return response
+
+    @staticmethod
+    def header(timings, view_name):
+        return ", ".join(
+            [
+                f'db;dur={timings.db_time * 1000:.2f};desc="{timings.db_queries} queries"',
+                f"tpl;dur={timings.template_time * 1000:.2f}",
+                f'cache;desc="{timings.cache_hits} hits, {timings.cache_misses} misses"',
+                f'view;dur={timings.total * 1000:.2f};desc="{view_name}"',
+            ]
+        )
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` that only counts statements
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Record request latency, DB query count, response size and 5xx errors
+    per URL name for the ``/metrics`` endpoint.
+
+    Disabled when ``METRICS_ENABLED`` is false or prometheus_client is missing.
+    """
+
+    def __init__(self, get_response):
+        if not (getattr(settings, "METRICS_ENABLED", True) and metrics.is_available()):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        metrics.observe_request(
+            request, response, time.perf_counter() - start, queries.count
+        )
+        return response
+
+
+class SlowQueryContextMiddleware:
+    """
+    Make the current request available to the slow-query logger so slow
+    statements are attributed to a URL name.
+    """
+
+    def __init__(self, get_response):
+        if getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None) is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = slow_queries.set_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            slow_queries.reset_request(token)
@@ -0,0 +1,91 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE newspapers_newspaper
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX newspapers_newspaper_search_vector_gin
+    ON newspapers_newspaper USING GIN (search_vector)
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS newspapers_newspaper_search_vector_gin",
+    "ALTER TABLE newspapers_newspaper DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE newspapers_newspaper_fts USING fts5(
+        title, content, content='newspapers_newspaper', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER newspapers_newspaper_fts_insert
+    AFTER INSERT ON newspapers_newspaper BEGIN
+        INSERT INTO newspapers_newspaper_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER newspapers_newspaper_fts_delete
+    AFTER DELETE ON newspapers_newspaper BEGIN
+        INSERT INTO newspapers_newspaper_fts(newspapers_newspaper_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER newspapers_newspaper_fts_update
+    AFTER UPDATE OF title, content ON newspapers_newspaper BEGIN
+        INSERT INTO newspapers_newspaper_fts(newspapers_newspaper_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO newspapers_newspaper_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO newspapers_newspaper_fts(newspapers_newspaper_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS newspapers_newspaper_fts_update",
+    "DROP TRIGGER IF EXISTS newspapers_newspaper_fts_delete",
+    "DROP TRIGGER IF EXISTS newspapers_newspaper_fts_insert",
+    "DROP TABLE IF EXISTS newspapers_newspaper_fts",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def run_statements(schema_editor, forward):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for sql in statements[0 if forward else 1]:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    run_statements(schema_editor, forward=True)
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(schema_editor, forward=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newspapers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
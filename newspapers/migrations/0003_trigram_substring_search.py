@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# The indexes cover UPPER(column::text), the expression Django emits for
+# ``icontains`` on PostgreSQL, so existing lookups can use them unchanged.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX newspapers_topic_name_trgm
+    ON newspapers_topic USING GIN (UPPER(name::text) gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX newspapers_redactor_username_trgm
+    ON newspapers_redactor USING GIN (UPPER(username::text) gin_trgm_ops)
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS newspapers_redactor_username_trgm",
+    "DROP INDEX IF EXISTS newspapers_topic_name_trgm",
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in POSTGRES_FORWARD:
+        schema_editor.execute(sql)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in POSTGRES_BACKWARD:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newspapers", "0002_newspaper_full_text_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
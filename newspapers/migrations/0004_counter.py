@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations, models
+
+COUNTED_MODELS = ("newspapers.Topic", settings.AUTH_USER_MODEL, "newspapers.Newspaper")
+
+
+def seed_counters(apps, schema_editor):
+    Counter = apps.get_model("newspapers", "Counter")
+    using = schema_editor.connection.alias
+    for label in COUNTED_MODELS:
+        model = apps.get_model(label)
+        Counter.objects.using(using).update_or_create(
+            name=model._meta.label_lower,
+            defaults={"value": model._default_manager.using(using).count()},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newspapers", "0003_trigram_substring_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ("name",),
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+INDEXES = [
+    models.Index(
+        fields=["topic", "published_date", "id"],
+        name="newspaper_topic_date_id_idx",
+    ),
+    models.Index(fields=["published_date", "id"], name="newspaper_date_id_idx"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    # Postgres builds the indexes without locking the table against writes.
+    Newspaper = apps.get_model("newspapers", "Newspaper")
+    concurrently = schema_editor.connection.vendor == "postgresql"
+    for index in INDEXES:
+        if concurrently:
+            schema_editor.add_index(Newspaper, index, concurrently=True)
+        else:
+            schema_editor.add_index(Newspaper, index)
+
+
+def drop_indexes(apps, schema_editor):
+    Newspaper = apps.get_model("newspapers", "Newspaper")
+    concurrently = schema_editor.connection.vendor == "postgresql"
+    for index in INDEXES:
+        if concurrently:
+            schema_editor.remove_index(Newspaper, index, concurrently=True)
+        else:
+            schema_editor.remove_index(Newspaper, index)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("newspapers", "0004_counter"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="newspaper", index=index)
+                for index in INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Partitioning is applied with the partition_newspapers management command,
+# not by this migration. Migrating backwards past it requires reverting the
+# partitioning first, since earlier migrations expect a plain table.
+
+
+def check_not_partitioned(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('newspapers_newspaper')"
+        )
+        if cursor.fetchone() is not None:
+            raise RuntimeError(
+                "newspapers_newspaper is partitioned; run "
+                "'manage.py partition_newspapers --revert' first"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newspapers", "0005_newspaper_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, check_not_partitioned),
+    ]
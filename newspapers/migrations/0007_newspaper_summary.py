@@ -0,0 +1,61 @@
+import math
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+# Frozen copy of newspapers.models.summarize_content as of this migration.
+EXCERPT_LENGTH = 150
+WORDS_PER_MINUTE = 200
+
+
+def summarize_content(content):
+    words = content.split()
+    excerpt = Truncator(" ".join(words)).chars(EXCERPT_LENGTH)
+    return excerpt, len(words), math.ceil(len(words) / WORDS_PER_MINUTE)
+
+
+def fill_summaries(apps, schema_editor):
+    Newspaper = apps.get_model("newspapers", "Newspaper")
+    newspapers = Newspaper.objects.using(schema_editor.connection.alias)
+    batch = []
+    for newspaper in newspapers.only("id", "content").iterator(chunk_size=1000):
+        (
+            newspaper.excerpt,
+            newspaper.word_count,
+            newspaper.reading_time,
+        ) = summarize_content(newspaper.content)
+        batch.append(newspaper)
+        if len(batch) >= 1000:
+            newspapers.bulk_update(batch, ["excerpt", "word_count", "reading_time"])
+            batch = []
+    if batch:
+        newspapers.bulk_update(batch, ["excerpt", "word_count", "reading_time"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newspapers", "0006_newspaper_partitioning"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="reading_time",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        # SQLite adds the columns by rebuilding the table, which drops the
+        # full-text search triggers; the post_migrate handler in
+        # newspapers.signals re-creates them.
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
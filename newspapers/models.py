@@ -1,7 +1,22 @@
+import math
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.urls import reverse
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 150
+WORDS_PER_MINUTE = 200
+
+
+def summarize_content(content):
+    """
+    Excerpt, word count and reading time in minutes of an article body
+    """
+    words = content.split()
+    excerpt = Truncator(" ".join(words)).chars(EXCERPT_LENGTH)
+    return excerpt, len(words), math.ceil(len(words) / WORDS_PER_MINUTE)
 
 
 class Topic(models.Model):
@@ -35,9 +50,19 @@ class Newspaper(models.Model):
     publishers = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="newspapers"
     )
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=["topic", "published_date", "id"],
+                name="newspaper_topic_date_id_idx",
+            ),
+            models.Index(fields=["published_date", "id"], name="newspaper_date_id_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -50,3 +75,38 @@ class Newspaper(models.Model):
 
     def get_absolute_url(self):
         return reverse("newspapers:newspaper-detail", args=[str(self.id)])
+
+    def update_summary(self):
+        self.excerpt, self.word_count, self.reading_time = summarize_content(
+            self.content
+        )
+
+    def save(self, *args, **kwargs):
+        # A deferred content was not edited, so the summary is still valid.
+        if "content" not in self.get_deferred_fields():
+            self.update_summary()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "content" in update_fields:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "excerpt",
+                    "word_count",
+                    "reading_time",
+                }
+        super().save(*args, **kwargs)
+
+
+class Counter(models.Model):
+    """
+    Maintained row count for a model, read by the index dashboard
+    instead of running COUNT(*) on every request
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
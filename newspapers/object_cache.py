@@ -0,0 +1,188 @@
+"""
+Read-through cache of the objects shown on newspaper and redactor detail
+pages.
+
+Every object has a version token in the cache and its data is stored
+under a key that includes the token. Invalidation replaces the token, so
+a load that raced with a write can only fill a key nobody reads any more.
+A miss is loaded by one caller: threads of a process queue on a local
+lock, and other workers wait on a lock key added to the shared cache.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Prefetch
+
+from newspapers import topics
+
+VERSION_CACHE_KEY = "newspapers:object:{name}:{pk}:version"
+OBJECT_CACHE_KEY = "newspapers:object:{name}:{pk}:{version}"
+DEFAULT_CACHE_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+_MISSING = object()
+_process_locks = [threading.Lock() for _ in range(64)]
+
+
+def _timeout():
+    return getattr(settings, "OBJECT_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def _version(name, pk):
+    key = VERSION_CACHE_KEY.format(name=name, pk=pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, _timeout())
+        version = cache.get(key)
+    return version
+
+
+def get_or_load(key, loader, timeout=None):
+    """
+    Value of ``key``, calling ``loader`` and caching its result on a miss
+    unless another caller is already doing so
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    with _process_locks[hash(key) % len(_process_locks)]:
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        while not locked:
+            time.sleep(LOCK_POLL_INTERVAL)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if time.monotonic() >= deadline:
+                # The loading worker died or is stuck; load without the lock.
+                break
+            locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        try:
+            value = loader()
+            cache.set(key, value, _timeout() if timeout is None else timeout)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return value
+
+
+def _get_object(name, pk, loader):
+    key = OBJECT_CACHE_KEY.format(name=name, pk=pk, version=_version(name, pk))
+    return get_or_load(key, lambda: loader(pk))
+
+
+def _load_newspaper(pk):
+    Newspaper = apps.get_model("newspapers", "Newspaper")
+    Redactor = apps.get_model("newspapers", "Redactor")
+    return Newspaper.objects.prefetch_related(
+        Prefetch(
+            "publishers",
+            queryset=Redactor.objects.only(
+                "id", "first_name", "last_name", "years_of_experience"
+            ),
+        )
+    ).get(pk=pk)
+
+
+def _load_redactor(pk):
+    Redactor = apps.get_model("newspapers", "Redactor")
+    return Redactor.objects.annotate(newspaper_count=Count("newspapers")).get(pk=pk)
+
+
+def get_newspaper(pk):
+    """
+    Newspaper ``pk`` with its publishers; the topic is attached from the
+    topic registry so topic edits need no invalidation here. Raises
+    ``Newspaper.DoesNotExist``.
+    """
+    newspaper = _get_object("newspaper", pk, _load_newspaper)
+    topics.attach([newspaper])
+    return newspaper
+
+
+def _secrets_digest():
+    secrets = "\0".join([settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS])
+    return hashlib.sha256(secrets.encode()).hexdigest()[:16]
+
+
+def _load_user(pk):
+    """
+    User ``pk`` without its password hash, and the session auth hashes for
+    the secret key and its fallbacks
+    """
+    user = get_user_model()._default_manager.get(pk=pk)
+    hashes = (user.get_session_auth_hash(), *user.get_session_auth_fallback_hash())
+    # A field missing from __dict__ is deferred: check_password() loads it
+    # on demand and save() leaves the column alone.
+    del user.__dict__["password"]
+    return user, hashes
+
+
+def _session_auth_hash(user, hashes):
+    if "password" in user.__dict__:
+        # Loaded or changed since, e.g. by set_password().
+        return type(user).get_session_auth_hash(user)
+    return hashes[0]
+
+
+def _session_auth_fallback_hash(user, hashes):
+    if "password" in user.__dict__:
+        return type(user).get_session_auth_fallback_hash(user)
+    return iter(hashes[1:])
+
+
+def get_user(pk):
+    """
+    User ``pk`` for session authentication. The cached copy leaves out the
+    password hash and answers ``get_session_auth_hash()`` from hashes
+    computed when it was loaded; entries are keyed by the secret keys too,
+    so rotating them loads the user again. Raises ``DoesNotExist``.
+    """
+    version = f"{_version('user', pk)}:{_secrets_digest()}"
+    key = OBJECT_CACHE_KEY.format(name="user", pk=pk, version=version)
+    user, hashes = get_or_load(key, lambda: _load_user(pk))
+    user.get_session_auth_hash = functools.partial(_session_auth_hash, user, hashes)
+    user.get_session_auth_fallback_hash = functools.partial(
+        _session_auth_fallback_hash, user, hashes
+    )
+    return user
+
+
+def get_redactor(pk):
+    """
+    Redactor ``pk`` annotated with ``newspaper_count``. Raises
+    ``Redactor.DoesNotExist``.
+    """
+    return _get_object("redactor", pk, _load_redactor)
+
+
+def _invalidate(name, pks):
+    if pks:
+        cache.delete_many(
+            [VERSION_CACHE_KEY.format(name=name, pk=pk) for pk in set(pks)]
+        )
+
+
+def invalidate_newspapers(pks):
+    _invalidate("newspaper", pks)
+
+
+def invalidate_redactors(pks):
+    _invalidate("redactor", pks)
+
+
+def invalidate_users(pks):
+    _invalidate("user", pks)
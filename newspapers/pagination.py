@@ -0,0 +1,290 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+CURSOR_SALT = "newspapers.pagination.cursor"
+DEFAULT_MAX_PAGE_SIZE = 100
+DEFAULT_EXACT_COUNT_THRESHOLD = 10000
+DEFAULT_COUNT_CACHE_TIMEOUT = 30
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated queryset with opaque navigation tokens
+    """
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over ``(ordering key, id)``.
+
+    Pages are fetched with ``WHERE (key, id) > (last key, last id) LIMIT n``,
+    so every page costs the same as the first one and no ``COUNT(*)`` is run.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None):
+        self.per_page = int(per_page)
+        self.ordering = self._normalize_ordering(
+            ordering or queryset.query.order_by or queryset.model._meta.ordering
+        )
+        self.queryset = queryset.order_by(*self.ordering)
+
+    @staticmethod
+    def _normalize_ordering(ordering):
+        ordering = [str(field) for field in ordering]
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            descending = ordering and ordering[-1].startswith("-")
+            ordering.append("-id" if descending else "id")
+        return tuple(
+            "id" if f == "pk" else "-id" if f == "-pk" else f for f in ordering
+        )
+
+    def _field(self, name):
+        try:
+            return self.queryset.model._meta.get_field(name.lstrip("-"))
+        except FieldDoesNotExist:
+            # Annotations such as a search rank are stored as raw JSON values.
+            return None
+
+    def _value(self, instance, name):
+        field = self._field(name)
+        if field is None:
+            return getattr(instance, name.lstrip("-"))
+        return field.value_to_string(instance)
+
+    def encode_cursor(self, instance, direction):
+        values = [self._value(instance, name) for name in self.ordering]
+        return signing.dumps([direction, values], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor")
+        if direction not in ("next", "prev") or len(values) != len(self.ordering):
+            raise InvalidCursor("Invalid cursor")
+        try:
+            values = [
+                value if field is None else field.to_python(value)
+                for field, value in zip(map(self._field, self.ordering), values)
+            ]
+        except Exception:
+            raise InvalidCursor("Invalid cursor")
+        return direction, values
+
+    def _keyset_filter(self, values, reverse):
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip("-")
+            ascending = not name.startswith("-")
+            lookup = "gt" if ascending != reverse else "lt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return tuple(
+            name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering
+        )
+
+    def page(self, cursor=None):
+        direction, values = ("next", None)
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+
+        queryset = self.queryset
+        if direction == "prev":
+            queryset = queryset.filter(self._keyset_filter(values, reverse=True))
+            queryset = queryset.order_by(*self._reversed_ordering())
+        elif values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, reverse=False))
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if direction == "prev":
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], "next")
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], "prev")
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+def count_cache_key(queryset):
+    """
+    Cache key for the row count of ``queryset``, identical for querysets
+    that only differ in ordering or selected related objects
+    """
+    query = queryset.order_by().query
+    sql, params = query.get_compiler(queryset.db).as_sql()
+    digest = hashlib.md5(
+        f"{sql}|{params!r}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"newspapers:count:{queryset.db}:{digest}"
+
+
+def estimate_count(queryset):
+    """
+    Planner estimate of the number of rows in ``queryset``, or None where
+    the database cannot provide one
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            # A partitioned table holds no rows itself (its reltuples is -1),
+            # so the estimate is the sum over its leaf partitions; a plain
+            # table is its own only leaf.
+            cursor.execute(
+                "SELECT SUM(GREATEST(c.reltuples, 0)), MAX(c.reltuples) "
+                "FROM pg_partition_tree(%s::regclass) AS t "
+                "JOIN pg_class AS c ON c.oid = t.relid WHERE t.isleaf",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 until a table has been vacuumed or analyzed.
+            if row and row[1] is not None and row[1] >= 0:
+                return int(row[0])
+            return None
+        sql, params = queryset.order_by().query.get_compiler(queryset.db).as_sql()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact ``COUNT(*)`` on large result sets.
+
+    Results estimated above ``ESTIMATED_COUNT_THRESHOLD`` rows report the
+    planner estimate; smaller ones are counted exactly. Either way the count
+    is cached per query for ``ESTIMATED_COUNT_CACHE_TIMEOUT`` seconds.
+    """
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+        try:
+            key = count_cache_key(self.object_list)
+        except EmptyResultSet:
+            return 0
+        count = cache.get(key)
+        if count is None:
+            count = self.estimate_or_count()
+            cache.set(
+                key,
+                count,
+                getattr(
+                    settings,
+                    "ESTIMATED_COUNT_CACHE_TIMEOUT",
+                    DEFAULT_COUNT_CACHE_TIMEOUT,
+                ),
+            )
+        return count
+
+    def estimate_or_count(self):
+        threshold = getattr(
+            settings, "ESTIMATED_COUNT_THRESHOLD", DEFAULT_EXACT_COUNT_THRESHOLD
+        )
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+        return self.object_list.count()
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin that replaces offset pagination with cursor pagination.
+
+    The page size comes from ``paginate_by`` and may be overridden with the
+    ``page_size`` query parameter, capped by ``CURSOR_PAGINATION_MAX_PAGE_SIZE``.
+    Requests with a ``page`` number fall back to ``EstimatedCountPaginator``.
+    """
+
+    cursor_kwarg = "cursor"
+    page_size_kwarg = "page_size"
+    cursor_ordering = None
+    paginator_class = EstimatedCountPaginator
+
+    def get_paginate_by(self, queryset):
+        page_size = super().get_paginate_by(queryset)
+        max_page_size = getattr(
+            settings, "CURSOR_PAGINATION_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE
+        )
+        try:
+            page_size = int(self.request.GET.get(self.page_size_kwarg, page_size))
+        except (TypeError, ValueError):
+            pass
+        if page_size is None:
+            return None
+        return max(1, min(page_size, max_page_size))
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        # Links with a page number still work, without an exact COUNT(*).
+        params = self.request.GET
+        if self.page_kwarg in params and self.cursor_kwarg not in params:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset, page_size, ordering=self.get_cursor_ordering()
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor")
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["cursor_pagination"] = isinstance(
+            context.get("paginator"), CursorPaginator
+        )
+        return context
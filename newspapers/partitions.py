@@ -0,0 +1,296 @@
+"""
+Range partitioning of the newspapers table by ``published_date``.
+
+Only used on Postgres, after running the ``partition_newspapers`` command
+(by ``NEWSPAPER_PARTITIONING``, ``"month"`` or ``"year"``); everywhere else
+``newspapers_newspaper`` stays a plain table.
+Queries that filter on ``published_date`` ranges (archives, date ordered
+pages) are pruned to the partitions they touch.
+
+Postgres requires the primary key of a partitioned table to include the
+partition key, so it becomes ``(id, published_date)`` with ids still drawn
+from one sequence, and foreign keys into the table (the publishers through
+table) cannot be enforced by the database.
+"""
+
+import datetime
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+TABLE = "newspapers_newspaper"
+PARTITION_KEY = "published_date"
+INTERVALS = ("month", "year")
+DEFAULT_PARTITION = f"{TABLE}_default"
+DEFAULT_PARTITIONS_AHEAD = 3
+
+# Foreign keys into the table, dropped while it is partitioned. Their names
+# and definitions are kept in the comment of the partitioned table and
+# restored from it on revert.
+INBOUND_FOREIGN_KEYS = (("newspapers_newspaper_publishers", "newspaper_id"),)
+
+
+def get_interval():
+    interval = getattr(settings, "NEWSPAPER_PARTITIONING", None) or None
+    if interval not in (None, *INTERVALS):
+        raise ImproperlyConfigured(
+            f"NEWSPAPER_PARTITIONING must be one of {', '.join(INTERVALS)} or empty"
+        )
+    return interval
+
+
+def get_partitions_ahead():
+    return getattr(settings, "NEWSPAPER_PARTITIONS_AHEAD", DEFAULT_PARTITIONS_AHEAD)
+
+
+def supports_partitioning(connection):
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned(connection):
+    if not supports_partitioning(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def period_start(day, interval):
+    if interval == "year":
+        return day.replace(month=1, day=1)
+    return day.replace(day=1)
+
+
+def next_period(start, interval):
+    if interval == "year":
+        return start.replace(year=start.year + 1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def iter_periods(first, last, interval):
+    """
+    Yield the start of every period from the one containing ``first`` to
+    the one containing ``last``
+    """
+    start = period_start(first, interval)
+    while start <= last:
+        yield start
+        start = next_period(start, interval)
+
+
+def partition_name(start, interval):
+    if interval == "year":
+        return f"{TABLE}_p{start:%Y}"
+    return f"{TABLE}_p{start:%Y_%m}"
+
+
+def create_partitions(connection, first, last, interval):
+    """
+    Create the missing partitions covering ``first`` to ``last`` and return
+    their names
+    """
+    quote = connection.ops.quote_name
+    created = []
+    with connection.cursor() as cursor:
+        for start in iter_periods(first, last, interval):
+            name = partition_name(start, interval)
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is not None:
+                continue
+            end = next_period(start, interval)
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} PARTITION OF {quote(TABLE)} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            created.append(name)
+    return created
+
+
+def create_future_partitions(connection, interval, ahead=None):
+    """
+    Create partitions from the current period to ``ahead`` periods later,
+    ``NEWSPAPER_PARTITIONS_AHEAD`` by default
+    """
+    if ahead is None:
+        ahead = get_partitions_ahead()
+    first = period_start(datetime.date.today(), interval)
+    last = first
+    for _ in range(ahead):
+        last = next_period(last, interval)
+    return create_partitions(connection, first, last, interval)
+
+
+def default_partition_rows(connection):
+    """
+    Rows that fell outside every dated partition; they block creating a
+    partition for their period until moved
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {quote(DEFAULT_PARTITION)}")
+        return cursor.fetchone()[0]
+
+
+def partition_table(connection, interval):
+    """
+    Rebuild the table as a range-partitioned one, moving every row into a
+    partition for its period
+    """
+    _rebuild_table(connection, interval)
+
+
+def unpartition_table(connection):
+    """
+    Rebuild the partitioned table as a plain one
+    """
+    _rebuild_table(connection, None)
+
+
+def _default_inbound_foreign_keys(connection):
+    """
+    Inbound foreign keys as Django's migrations name and define them, for
+    tables partitioned without a record of the dropped ones
+    """
+    schema_editor = connection.schema_editor()
+    return [
+        (
+            table,
+            schema_editor._create_index_name(table, [column], suffix=f"_fk_{TABLE}_id"),
+            f"FOREIGN KEY ({column}) REFERENCES {TABLE}(id) "
+            f"DEFERRABLE INITIALLY DEFERRED",
+        )
+        for table, column in INBOUND_FOREIGN_KEYS
+    ]
+
+
+def _dropped_inbound_foreign_keys(connection, cursor):
+    """
+    ``(table, name, definition)`` of the foreign keys dropped when the
+    table was partitioned
+    """
+    cursor.execute("SELECT obj_description(%s::regclass, 'pg_class')", [TABLE])
+    comment = cursor.fetchone()[0]
+    try:
+        return [tuple(key) for key in json.loads(comment)["inbound_foreign_keys"]]
+    except (TypeError, ValueError, KeyError):
+        return _default_inbound_foreign_keys(connection)
+
+
+def _rebuild_table(connection, interval):
+    quote = connection.ops.quote_name
+    old_table = f"{TABLE}_old"
+    sequence = f"{TABLE}_id_seq"
+    with connection.cursor() as cursor:
+        # Deferred foreign key checks left pending in this transaction would
+        # block altering the tables.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = %s "
+            "AND indexname <> %s",
+            [TABLE, f"{TABLE}_pkey"],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+            "FROM pg_constraint "
+            "WHERE confrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        inbound = cursor.fetchall()
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = %s "
+            "AND is_generated = 'NEVER' ORDER BY ordinal_position",
+            [TABLE],
+        )
+        columns = ", ".join(quote(row[0]) for row in cursor.fetchall())
+        cursor.execute(
+            f"SELECT MIN({PARTITION_KEY}), MAX({PARTITION_KEY}), MAX(id) "
+            f"FROM {quote(TABLE)}"
+        )
+        first, last, max_id = cursor.fetchone()
+        if not interval:
+            restored = _dropped_inbound_foreign_keys(connection, cursor)
+
+        # Free the names of the table, its indexes and primary key.
+        for table, name, _ in inbound:
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {quote(name)}")
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {quote(name)}")
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} DROP CONSTRAINT {quote(TABLE + '_pkey')}"
+        )
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(old_table)}")
+
+        partition_clause = f" PARTITION BY RANGE ({PARTITION_KEY})" if interval else ""
+        cursor.execute(
+            f"CREATE TABLE {quote(TABLE)} "
+            f"(LIKE {quote(old_table)} INCLUDING CONSTRAINTS INCLUDING DEFAULTS "
+            f"INCLUDING GENERATED){partition_clause}"
+        )
+        if interval:
+            cursor.execute(
+                f"COMMENT ON TABLE {quote(TABLE)} IS %s",
+                [json.dumps({"inbound_foreign_keys": inbound})],
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote(DEFAULT_PARTITION)} "
+                f"PARTITION OF {quote(TABLE)} DEFAULT"
+            )
+            if first is not None:
+                create_partitions(connection, first, last, interval)
+            create_future_partitions(connection, interval)
+
+        cursor.execute(
+            f"INSERT INTO {quote(TABLE)} ({columns}) "
+            f"SELECT {columns} FROM {quote(old_table)}"
+        )
+        cursor.execute(f"DROP TABLE {quote(old_table)}")
+
+        primary_key = f"id, {PARTITION_KEY}" if interval else "id"
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} "
+            f"ADD CONSTRAINT {quote(TABLE + '_pkey')} PRIMARY KEY ({primary_key})"
+        )
+        start = (max_id or 0) + 1
+        if interval:
+            # Identity columns are not supported on partitioned tables.
+            cursor.execute(
+                f"CREATE SEQUENCE {quote(sequence)} START WITH {start} "
+                f"OWNED BY {quote(TABLE)}.id"
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id "
+                f"SET DEFAULT nextval('{sequence}')"
+            )
+        else:
+            cursor.execute(
+                f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id "
+                f"ADD GENERATED BY DEFAULT AS IDENTITY (START WITH {start})"
+            )
+
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(name)} {definition}"
+            )
+        for _, definition in indexes:
+            # Indexes of a partitioned table are defined "ON ONLY" the parent.
+            cursor.execute(definition.replace(" ON ONLY ", " ON ", 1))
+        if not interval:
+            for table, name, definition in restored:
+                cursor.execute(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {quote(name)} {definition}"
+                )
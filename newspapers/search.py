@@ -0,0 +1,251 @@
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Length
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "newspapers_newspaper_fts"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Triggers keeping the FTS5 table in sync. SQLite drops them whenever a
+# migration rebuilds newspapers_newspaper, so they are re-created after
+# every migrate (see ``ensure_sqlite_search_triggers``).
+SQLITE_TRIGGERS = {
+    "newspapers_newspaper_fts_insert": f"""
+    CREATE TRIGGER IF NOT EXISTS newspapers_newspaper_fts_insert
+    AFTER INSERT ON newspapers_newspaper BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "newspapers_newspaper_fts_delete": f"""
+    CREATE TRIGGER IF NOT EXISTS newspapers_newspaper_fts_delete
+    AFTER DELETE ON newspapers_newspaper BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    "newspapers_newspaper_fts_update": f"""
+    CREATE TRIGGER IF NOT EXISTS newspapers_newspaper_fts_update
+    AFTER UPDATE OF title, content ON newspapers_newspaper BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+}
+
+
+class PostgresNewspaperSearch:
+    """
+    Ranked search over the generated ``search_vector`` tsvector column (GIN indexed)
+    """
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVectorField,
+        )
+
+        table = queryset.model._meta.db_table
+        vector = RawSQL(f'"{table}"."search_vector"', [], SearchVectorField())
+        search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(vector, search_query))
+            .order_by("-search_rank", "-id")
+        )
+
+
+class SQLiteNewspaperSearch:
+    """
+    Ranked search over the FTS5 table kept in sync with newspapers by triggers
+    """
+
+    @staticmethod
+    def to_match_expression(query):
+        tokens = TOKEN_RE.findall(query)
+        return " ".join(f'"{token}"' for token in tokens)
+
+    def search(self, queryset, query):
+        match = self.to_match_expression(query)
+        if not match:
+            return queryset.none()
+        table = queryset.model._meta.db_table
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+            [match],
+            output_field=FloatField(),
+        )
+        matching_ids = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+        )
+        return (
+            queryset.filter(id__in=matching_ids)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "-id")
+        )
+
+
+class PostgresSubstringSearch:
+    """
+    Case-insensitive substring search served by ``pg_trgm`` GIN indexes.
+
+    The indexes are built on ``UPPER(column::text)``, the exact expression
+    Django emits for ``icontains``, and results are ordered by trigram
+    similarity.
+    """
+
+    def search(self, queryset, field, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return (
+            queryset.filter(**{f"{field}__icontains": query})
+            .annotate(similarity=TrigramSimilarity(field, query))
+            .order_by("-similarity", field)
+        )
+
+
+class SQLiteSubstringSearch:
+    """
+    Bounded ``LIKE`` scan: at most ``SUBSTRING_SEARCH_FALLBACK_LIMIT`` matches
+    are considered, ranked by the share of the value covered by the query.
+    """
+
+    def search(self, queryset, field, query):
+        limit = getattr(settings, "SUBSTRING_SEARCH_FALLBACK_LIMIT", 1000)
+        candidates = queryset.filter(**{f"{field}__icontains": query})
+        similarity = Cast(Value(len(query)), FloatField()) / Length(field)
+        return (
+            queryset.filter(pk__in=candidates.order_by().values("pk")[:limit])
+            .annotate(similarity=similarity)
+            .order_by("-similarity", field)
+        )
+
+
+class PostgresPrefixSearch:
+    """
+    Case-insensitive prefix search; ``istartswith`` compiles to
+    ``UPPER(column::text) LIKE`` and is served by the same trigram indexes
+    as substring search.
+    """
+
+    def search(self, queryset, field, query):
+        return queryset.filter(**{f"{field}__istartswith": query}).order_by(field)
+
+
+class SQLitePrefixSearch:
+    """
+    Prefix search as a range over ``field`` so its B-tree index is used;
+    SQLite never uses an index for ``LIKE ... ESCAPE``, so the match is
+    case-sensitive.
+    """
+
+    def search(self, queryset, field, query):
+        return queryset.filter(
+            **{f"{field}__gte": query, f"{field}__lt": query + "\U0010ffff"}
+        ).order_by(field)
+
+
+BACKENDS = {
+    "postgresql": PostgresNewspaperSearch,
+    "sqlite": SQLiteNewspaperSearch,
+}
+
+SUBSTRING_BACKENDS = {
+    "postgresql": PostgresSubstringSearch,
+    "sqlite": SQLiteSubstringSearch,
+}
+
+
+PREFIX_BACKENDS = {
+    "postgresql": PostgresPrefixSearch,
+    "sqlite": SQLitePrefixSearch,
+}
+
+
+def _get_backend(backends, using, label):
+    vendor = connections[using].vendor
+    try:
+        return backends[vendor]()
+    except KeyError:
+        raise NotImplementedError(f"{label} is not supported on {vendor}")
+
+
+def get_search_backend(using="default"):
+    return _get_backend(BACKENDS, using, "Full-text search")
+
+
+def get_substring_search_backend(using="default"):
+    return _get_backend(SUBSTRING_BACKENDS, using, "Substring search")
+
+
+def get_prefix_search_backend(using="default"):
+    return _get_backend(PREFIX_BACKENDS, using, "Prefix search")
+
+
+def ensure_sqlite_search_triggers(using="default"):
+    """
+    Re-create missing FTS5 sync triggers on SQLite and rebuild the index
+    they may have missed writes for; returns the names re-created
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return []
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if FTS_TABLE not in tables:
+            # Migrated backwards past the search migration.
+            return []
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+            ["newspapers_newspaper"],
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return missing
+
+
+def search_newspapers(queryset, query):
+    """
+    Filter ``queryset`` to newspapers matching ``query`` in title or content,
+    annotated with ``search_rank`` and ordered best match first.
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset
+    return get_search_backend(queryset.db).search(queryset, query)
+
+
+def search_substring(queryset, field, query):
+    """
+    Filter ``queryset`` to rows whose ``field`` contains ``query``,
+    annotated with ``similarity`` and ordered best match first.
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset
+    return get_substring_search_backend(queryset.db).search(queryset, field, query)
+
+
+def search_prefix(queryset, field, query):
+    """
+    Filter ``queryset`` to rows whose ``field`` starts with ``query``,
+    ordered by ``field``.
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset.none()
+    return get_prefix_search_backend(queryset.db).search(queryset, field, query)
@@ -0,0 +1,197 @@
+from functools import partial
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+
+from newspapers import archive, counters, fragments, object_cache, search, topics
+
+# Redactor fields rendered on newspaper detail pages.
+PUBLISHER_DETAIL_FIELDS = {"first_name", "last_name", "years_of_experience"}
+
+
+def count_created(sender, instance, created, using, **kwargs):
+    if created:
+        counters.increment(sender, 1, using=using)
+
+
+def count_deleted(sender, instance, using, **kwargs):
+    counters.increment(sender, -1, using=using)
+
+
+def invalidate_archive(sender, instance, using, **kwargs):
+    # After commit, so a concurrent request cannot cache the old counts again.
+    transaction.on_commit(archive.invalidate, using=using)
+
+
+def invalidate_topics(sender, instance, using, **kwargs):
+    transaction.on_commit(topics.invalidate, using=using)
+
+
+def _on_commit_invalidate(using, newspapers=(), redactors=()):
+    # Querysets are evaluated now, the related rows may be gone by then.
+    transaction.on_commit(
+        partial(_invalidate_objects, set(newspapers), set(redactors)), using=using
+    )
+
+
+def _invalidate_objects(newspapers, redactors):
+    object_cache.invalidate_newspapers(newspapers)
+    object_cache.invalidate_redactors(redactors)
+
+
+def invalidate_newspaper_saved(sender, instance, using, **kwargs):
+    _on_commit_invalidate(using, newspapers=[instance.pk])
+
+
+def invalidate_newspaper_deleted(sender, instance, using, **kwargs):
+    # Before the delete, while the publishers can still be read.
+    publishers = instance.publishers.values_list("pk", flat=True)
+    _on_commit_invalidate(using, newspapers=[instance.pk], redactors=publishers)
+
+
+def invalidate_redactor_saved(
+    sender, instance, created, using, update_fields, **kwargs
+):
+    newspapers = ()
+    # A new redactor publishes nothing yet; logins only touch last_login.
+    if not created and (
+        update_fields is None or PUBLISHER_DETAIL_FIELDS & set(update_fields)
+    ):
+        newspapers = instance.newspapers.values_list("pk", flat=True)
+    _on_commit_invalidate(using, newspapers=newspapers, redactors=[instance.pk])
+
+
+def invalidate_redactor_deleted(sender, instance, using, **kwargs):
+    newspapers = instance.newspapers.values_list("pk", flat=True)
+    _on_commit_invalidate(using, newspapers=newspapers, redactors=[instance.pk])
+
+
+def invalidate_user(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        partial(object_cache.invalidate_users, [instance.pk]), using=using
+    )
+
+
+def invalidate_user_logged_out(sender, request, user, **kwargs):
+    if user is not None:
+        object_cache.invalidate_users([user.pk])
+
+
+def invalidate_publishers_changed(
+    sender, instance, action, reverse, pk_set, using, **kwargs
+):
+    if action == "pre_clear":
+        related = instance.newspapers if reverse else instance.publishers
+        pk_set = related.values_list("pk", flat=True)
+    elif action not in ("post_add", "post_remove"):
+        return
+    if reverse:
+        newspapers, redactors = set(pk_set), [instance.pk]
+    else:
+        newspapers, redactors = [instance.pk], set(pk_set)
+    _on_commit_invalidate(using, newspapers=newspapers, redactors=redactors)
+    # Only newspaper rows list publishers.
+    newspaper = apps.get_model("newspapers", "Newspaper")
+    transaction.on_commit(
+        partial(fragments.purge, fragments.surrogate_keys(newspaper, newspapers)),
+        using=using,
+    )
+
+
+def purge_fragments(sender, instance, using, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no row shows.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    transaction.on_commit(
+        partial(fragments.purge, [fragments.surrogate_key(instance)]), using=using
+    )
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    # Table rebuilds in any later migration drop the SQLite FTS triggers.
+    search.ensure_sqlite_search_triggers(using)
+
+
+def connect_signals():
+    for model in counters.get_counted_models():
+        name = counters.counter_name(model)
+        post_save.connect(
+            count_created, sender=model, dispatch_uid=f"count_created_{name}"
+        )
+        post_delete.connect(
+            count_deleted, sender=model, dispatch_uid=f"count_deleted_{name}"
+        )
+    newspaper = apps.get_model("newspapers", "Newspaper")
+    post_save.connect(
+        invalidate_archive, sender=newspaper, dispatch_uid="invalidate_archive_saved"
+    )
+    post_delete.connect(
+        invalidate_archive, sender=newspaper, dispatch_uid="invalidate_archive_deleted"
+    )
+    topic = apps.get_model("newspapers", "Topic")
+    post_save.connect(
+        invalidate_topics, sender=topic, dispatch_uid="invalidate_topics_saved"
+    )
+    post_delete.connect(
+        invalidate_topics, sender=topic, dispatch_uid="invalidate_topics_deleted"
+    )
+    post_save.connect(
+        invalidate_newspaper_saved,
+        sender=newspaper,
+        dispatch_uid="invalidate_newspaper_object_saved",
+    )
+    pre_delete.connect(
+        invalidate_newspaper_deleted,
+        sender=newspaper,
+        dispatch_uid="invalidate_newspaper_object_deleted",
+    )
+    redactor = apps.get_model("newspapers", "Redactor")
+    post_save.connect(
+        invalidate_redactor_saved,
+        sender=redactor,
+        dispatch_uid="invalidate_redactor_object_saved",
+    )
+    pre_delete.connect(
+        invalidate_redactor_deleted,
+        sender=redactor,
+        dispatch_uid="invalidate_redactor_object_deleted",
+    )
+    m2m_changed.connect(
+        invalidate_publishers_changed,
+        sender=newspaper.publishers.through,
+        dispatch_uid="invalidate_publishers_changed",
+    )
+    for model in (newspaper, redactor, topic):
+        name = model._meta.model_name
+        post_save.connect(
+            purge_fragments, sender=model, dispatch_uid=f"purge_fragments_saved_{name}"
+        )
+        post_delete.connect(
+            purge_fragments,
+            sender=model,
+            dispatch_uid=f"purge_fragments_deleted_{name}",
+        )
+    user = get_user_model()
+    post_save.connect(
+        invalidate_user, sender=user, dispatch_uid="invalidate_user_saved"
+    )
+    post_delete.connect(
+        invalidate_user, sender=user, dispatch_uid="invalidate_user_deleted"
+    )
+    user_logged_out.connect(
+        invalidate_user_logged_out, dispatch_uid="invalidate_user_logged_out"
+    )
+    post_migrate.connect(
+        restore_search_triggers,
+        sender=apps.get_app_config("newspapers"),
+        dispatch_uid="restore_search_triggers",
+    )
@@ -0,0 +1,114 @@
+import json
+import logging
+import random
+import sys
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.backends.signals import connection_created
+
+from newspapers.sql import fingerprint_sql, find_call_site
+
+logger = logging.getLogger("newspapers.slow_queries")
+
+_current_request = ContextVar("newspapers_slow_query_request", default=None)
+_explaining = ContextVar("newspapers_slow_query_explaining", default=False)
+
+
+def set_request(request):
+    return _current_request.set(request)
+
+
+def reset_request(token):
+    _current_request.reset(token)
+
+
+def current_view_name():
+    request = _current_request.get()
+    if request is None:
+        return None
+    match = request.resolver_match
+    return match.view_name if match else request.path
+
+
+def explain(connection, sql, params):
+    """
+    Return the Postgres plan of a SELECT as a list of lines, or ``None``
+    """
+    if connection.vendor != "postgresql" or not sql.lstrip().upper().startswith(
+        "SELECT"
+    ):
+        return None
+    token = _explaining.set(True)
+    try:
+        # In a savepoint, so a failing EXPLAIN does not abort the caller's
+        # transaction.
+        with transaction.atomic(using=connection.alias, savepoint=True):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                return [row[0] for row in cursor.fetchall()]
+    except DatabaseError as error:
+        return [f"EXPLAIN failed: {error}"]
+    finally:
+        _explaining.reset(token)
+
+
+class SlowQueryLogger:
+    """
+    Execute wrapper logging every statement slower than ``SLOW_QUERY_THRESHOLD_MS``
+    with its view, call site, normalized SQL and (on Postgres) plan.
+
+    ``SLOW_QUERY_SAMPLE_RATE`` limits how many slow statements are reported.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        if _explaining.get():
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+            if duration >= threshold and random.random() < getattr(
+                settings, "SLOW_QUERY_SAMPLE_RATE", 1.0
+            ):
+                self.report(sql, params, many, context, duration)
+
+    def report(self, sql, params, many, context, duration):
+        record = {
+            "duration_ms": round(duration * 1000, 2),
+            "view": current_view_name(),
+            "call_site": find_call_site(sys._getframe(2)),
+            "sql": fingerprint_sql(sql),
+        }
+        if not many and getattr(settings, "SLOW_QUERY_EXPLAIN", True):
+            record["explain"] = explain(context["connection"], sql, params)
+        logger.warning(json.dumps(record))
+
+
+slow_query_logger = SlowQueryLogger()
+
+
+def install_wrapper(connection):
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
+
+
+def on_connection_created(sender, connection, **kwargs):
+    if connection.alias == "default":
+        install_wrapper(connection)
+
+
+def install():
+    """
+    Attach the slow-query logger to the ``default`` connection in every
+    thread, unless ``SLOW_QUERY_THRESHOLD_MS`` is ``None``.
+    """
+    if getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None) is None:
+        return
+    connection_created.connect(
+        on_connection_created, dispatch_uid="newspapers_slow_queries"
+    )
@@ -0,0 +1,57 @@
+import os
+import re
+
+import django
+from django.conf import settings
+
+DJANGO_DIR = os.path.dirname(django.__file__)
+TEMPLATE_RENDER_FILE = os.path.join(DJANGO_DIR, "template", "base.py")
+IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Frames from the query instrumentation itself are never reported as call sites.
+INSTRUMENTATION_MODULES = {
+    "newspapers.middleware",
+    "newspapers.slow_queries",
+    "newspapers.sql",
+    "newspapers.timing",
+}
+
+
+def fingerprint_sql(sql):
+    """
+    Reduce a query to its shape: parameters are already placeholders, so only
+    whitespace and the length of ``IN (...)`` lists need normalizing.
+    """
+    sql = WHITESPACE_RE.sub(" ", sql).strip()
+    return IN_LIST_RE.sub("(%s, ...)", sql)
+
+
+def _is_project_frame(frame):
+    filename = frame.f_code.co_filename
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and "site-packages" not in filename
+        and frame.f_globals.get("__name__") not in INSTRUMENTATION_MODULES
+    )
+
+
+def find_call_site(frame):
+    """
+    Return the innermost template line or project source line that led to ``frame``
+    """
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == TEMPLATE_RENDER_FILE and code.co_name == (
+            "render_annotated"
+        ):
+            node = frame.f_locals.get("self")
+            origin = getattr(node, "origin", None)
+            token = getattr(node, "token", None)
+            if origin is not None and token is not None:
+                return f"{origin.template_name or origin.name}:{token.lineno}"
+        elif _is_project_frame(frame):
+            filename = os.path.relpath(code.co_filename, settings.BASE_DIR)
+            return f"{filename}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "<unknown>"
@@ -0,0 +1,17 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from newspapers import fragments
+
+register = template.Library()
+
+
+@register.simple_tag
+def cached_rows(objects, template_name, name, current=None):
+    """
+    Render ``template_name`` once per object, reusing cached rows; see
+    ``newspapers.fragments.render_rows``
+    """
+    return mark_safe(
+        "".join(fragments.render_rows(template_name, objects, name, current))
+    )
@@ -0,0 +1,51 @@
+"""
+Test runner that starts every test with empty caches.
+
+Sessions, cached users and objects are cached by primary key, and primary
+keys are handed out again once a test's transaction is rolled back, so an
+entry left by one test would be read by the next. Caches are cleared when
+the result starts a test: after ``setUpTestData()`` and before ``setUp()``,
+in serial and parallel runs alike.
+"""
+
+import unittest
+
+from django.core.cache import caches
+from django.test.runner import (
+    DiscoverRunner,
+    ParallelTestSuite,
+    RemoteTestResult,
+    RemoteTestRunner,
+)
+
+
+class CacheClearingResultMixin:
+    def startTest(self, test):
+        for cache in caches.all(initialized_only=True):
+            cache.clear()
+        super().startTest(test)
+
+
+class CacheClearingRemoteTestResult(CacheClearingResultMixin, RemoteTestResult):
+    pass
+
+
+class CacheClearingRemoteTestRunner(RemoteTestRunner):
+    resultclass = CacheClearingRemoteTestResult
+
+
+class CacheClearingParallelTestSuite(ParallelTestSuite):
+    runner_class = CacheClearingRemoteTestRunner
+
+
+class CacheClearingDiscoverRunner(DiscoverRunner):
+    parallel_test_suite = CacheClearingParallelTestSuite
+
+    def get_resultclass(self):
+        # --debug-sql and --pdb pick their own result class.
+        resultclass = super().get_resultclass() or unittest.TextTestResult
+        return type(
+            f"CacheClearing{resultclass.__name__}",
+            (CacheClearingResultMixin, resultclass),
+            {},
+        )
@@ -1,10 +1,18 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+
+from newspapers.models import Newspaper, Topic
+from newspapers.pagination import EstimatedCountPaginator
 
 
 class AdminSiteTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.admin_user = get_user_model().objects.create_superuser(
             username="admin",
@@ -50,3 +58,56 @@ class AdminSiteTests(TestCase):
         self.assertContains(res, "Last name")
         self.assertContains(res, "5")
         self.assertContains(res, str(self.redactor.years_of_experience))
+
+    def test_newspaper_changelist_uses_estimated_count_paginator(self):
+        """
+        Test that the newspaper admin changelist paginates without an exact
+        count of large tables
+        :return:
+        """
+        url = reverse("admin:newspapers_newspaper_changelist")
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertIsInstance(res.context["cl"].paginator, EstimatedCountPaginator)
+
+    def test_newspaper_changelist_projects_columns(self):
+        """
+        Test that the newspaper changelist renders the stored excerpt
+        without loading content and in a constant number of queries
+        :return:
+        """
+        topic = Topic.objects.create(name="Politics")
+        for index in range(5):
+            Newspaper.objects.create(
+                title=f"newspaper_{index}",
+                content="word " * 100,
+                published_date=timezone.now(),
+                topic=topic,
+            )
+        url = reverse("admin:newspapers_newspaper_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertContains(res, "word word")
+        self.assertContains(res, "…")
+        self.assertNotContains(res, "word " * 40)
+        self.assertContains(res, "Politics")
+        newspaper_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "newspapers_newspaper"' in query["sql"]
+        ]
+        # Paginated rows plus the cached page count; no full result count.
+        self.assertEqual(len(newspaper_queries), 2)
+        for sql in newspaper_queries:
+            self.assertNotIn('"newspapers_newspaper"."content"', sql.split("FROM")[0])
+
+    def test_redactor_search_uses_substring_search(self):
+        url = reverse("admin:newspapers_redactor_changelist")
+        res = self.client.get(url, {"q": "dact"})
+        self.assertContains(res, "redactor_first")
+        self.assertNotContains(res, "test_admin")
+
+    def test_newspaper_add_uses_autocomplete_widgets(self):
+        url = reverse("admin:newspapers_newspaper_add")
+        res = self.client.get(url)
+        self.assertContains(res, 'class="admin-autocomplete"', count=2)
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from newspapers import object_cache
+
+ABOUT_URL = reverse("newspapers:about-us")
+
+
+class CachedSessionUserTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test123", first_name="Old"
+        )
+        self.client.force_login(self.user)
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ABOUT_URL)
+        self.assertEqual(response.status_code, 200)
+        return [
+            query["sql"]
+            for query in queries
+            if 'FROM "newspapers_redactor"' in query["sql"]
+        ]
+
+    def test_session_user_is_cached(self) -> None:
+        """
+        Only the first authenticated request loads the user row.
+        :return:
+        """
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+    def test_password_hash_is_not_cached(self) -> None:
+        """
+        The cached session user leaves out the password hash but still
+        verifies sessions and checks passwords.
+        :return:
+        """
+        self.client.get(ABOUT_URL)
+        password = self.user.password.encode()
+        self.assertFalse(
+            any(password in value for value in cache._cache.values()),
+            "password hash found in the cache",
+        )
+        user = object_cache.get_user(self.user.pk)
+        self.assertIn("password", user.get_deferred_fields())
+        self.assertEqual(
+            user.get_session_auth_hash(), self.user.get_session_auth_hash()
+        )
+        self.assertTrue(user.check_password("test123"))
+
+    def test_changed_password_gets_a_new_session_hash(self) -> None:
+        user = object_cache.get_user(self.user.pk)
+        old_hash = user.get_session_auth_hash()
+        user.set_password("changed123")
+        self.assertNotEqual(user.get_session_auth_hash(), old_hash)
+
+    def test_rotated_secret_key_keeps_sessions(self) -> None:
+        """
+        After rotating SECRET_KEY a session hashed with the old key is
+        verified against the fallback hash and stays logged in.
+        :return:
+        """
+        self.client.get(ABOUT_URL)
+        with self.settings(
+            SECRET_KEY="rotated", SECRET_KEY_FALLBACKS=[settings.SECRET_KEY]
+        ):
+            response = self.client.get(ABOUT_URL)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_save_invalidates(self) -> None:
+        self.client.get(ABOUT_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "New"
+            self.user.save()
+        response = self.client.get(ABOUT_URL)
+        self.assertEqual(response.wsgi_request.user.first_name, "New")
+
+    def test_password_change_ends_other_sessions(self) -> None:
+        """
+        A session started before a password change is no longer accepted,
+        instead of being verified against the cached old session hash.
+        :return:
+        """
+        self.client.get(ABOUT_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("changed123")
+            self.user.save()
+        response = self.client.get(ABOUT_URL)
+        self.assertRedirects(
+            response,
+            f"{reverse('login')}?next={ABOUT_URL}",
+            fetch_redirect_response=False,
+        )
+
+    def test_logout_and_deactivation(self) -> None:
+        self.client.get(ABOUT_URL)
+        version_key = object_cache.VERSION_CACHE_KEY.format(
+            name="user", pk=self.user.pk
+        )
+        self.assertIsNotNone(cache.get(version_key))
+        self.client.post(reverse("logout"))
+        self.assertIsNone(cache.get(version_key))
+
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get(ABOUT_URL).status_code, 302)
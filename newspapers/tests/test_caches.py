@@ -0,0 +1,262 @@
+import importlib.util
+import os
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+WORKER_SCRIPT = """
+import sys
+import django
+django.setup()
+from django.core.cache import cache
+if sys.argv[1] == "set":
+    cache.set("shared", "from another worker")
+else:
+    print(cache.get("shared"))
+"""
+
+
+def run_worker(command, **env):
+    return subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT, command],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "inform_agency.settings.dev",
+            **env,
+        },
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+class SharedFileCacheTest(SimpleTestCase):
+    def test_workers_share_the_file_cache(self) -> None:
+        """
+        Checks that a value written by one process is read by another, and
+        that the version setting separates deploys.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            env = {"CACHE_BACKEND": "file", "CACHE_LOCATION": directory}
+            run_worker("set", **env)
+            self.assertEqual(run_worker("get", **env), "from another worker")
+            self.assertEqual(run_worker("get", CACHE_VERSION="2", **env), "None")
+            self.assertEqual(run_worker("get", CACHE_KEY_PREFIX="other", **env), "None")
+
+
+PROD_SETTINGS_SCRIPT = """
+from inform_agency.settings import prod
+default = prod.CACHES["default"]
+print(default["BACKEND"], default["LOCATION"], "OPTIONS" in default)
+"""
+
+
+class ProductionCacheSettingsTest(SimpleTestCase):
+    def load_prod_settings(self, **env):
+        environ = {
+            key: value for key, value in os.environ.items() if key != "CACHE_BACKEND"
+        }
+        return subprocess.run(
+            [sys.executable, "-c", PROD_SETTINGS_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env={
+                **environ,
+                "PG_DATABASE": "db",
+                "PG_USER": "user",
+                "PG_PASSWORD": "password",
+                "PG_HOST": "localhost",
+                "PG_DB_PORT": "5432",
+                **env,
+            },
+            capture_output=True,
+            text=True,
+        )
+
+    def test_defaults_to_redis(self) -> None:
+        """
+        Checks that production settings default to Redis on this host and
+        drop the entry limits that only locmem and file caches accept.
+        :return:
+        """
+        result = self.load_prod_settings(CACHE_BACKEND="")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(
+            result.stdout.split(),
+            [settings.CACHE_BACKENDS["redis"], "redis://127.0.0.1:6379/0", "False"],
+        )
+        result = self.load_prod_settings(
+            CACHE_BACKEND="memcached", CACHE_LOCATION="cache:11211"
+        )
+        self.assertEqual(
+            result.stdout.split(),
+            [settings.CACHE_BACKENDS["memcached"], "cache:11211", "False"],
+        )
+
+    def test_refuses_caches_without_atomic_operations(self) -> None:
+        """
+        Checks that production settings refuse locmem caches, which keep
+        sessions and invalidations inside one worker, and file caches,
+        whose add() and incr() are not atomic across workers.
+        :return:
+        """
+        for backend in ("locmem", "file"):
+            with self.subTest(backend=backend):
+                result = self.load_prod_settings(CACHE_BACKEND=backend)
+                self.assertNotEqual(result.returncode, 0)
+                self.assertIn("ImproperlyConfigured", result.stderr)
+
+
+class CacheEntryLimitTest(SimpleTestCase):
+    def test_local_caches_keep_more_than_the_default_entries(self) -> None:
+        if settings.CACHE_BACKEND not in ("locmem", "file"):
+            self.skipTest("Entry limits only apply to locmem and file caches")
+        cache = caches["default"]
+        self.assertEqual(cache._max_entries, settings.CACHE_MAX_ENTRIES)
+        self.assertEqual(cache._cull_frequency, settings.CACHE_CULL_FREQUENCY)
+        self.assertGreater(cache._max_entries, 300)
+
+
+class MemcachedStandIn(socketserver.ThreadingTCPServer):
+    """
+    Just enough of the memcached text protocol for ``PyMemcacheCache``
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MemcachedHandler)
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def live(self, key):
+        item = self.data.get(key)
+        if item and item[2] and item[2] < time.time():
+            del self.data[key]
+            return None
+        return item
+
+
+class MemcachedHandler(socketserver.StreamRequestHandler):
+    def reply(self, line, noreply=False):
+        if not noreply:
+            self.wfile.write(line + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        for line in self.rfile:
+            command, *args = line.split()
+            noreply = args[-1:] == [b"noreply"]
+            with server.lock:
+                if command in (b"get", b"gets"):
+                    for key in args:
+                        item = server.live(key)
+                        if item:
+                            self.wfile.write(
+                                b"VALUE %s %d %d\r\n%s\r\n"
+                                % (key, item[1], len(item[0]), item[0])
+                            )
+                    self.reply(b"END")
+                elif command in (b"set", b"add", b"replace"):
+                    key, flags, expire, size = args[:4]
+                    value = self.rfile.read(int(size) + 2)[:-2]
+                    exists = server.live(key) is not None
+                    if (command == b"add" and exists) or (
+                        command == b"replace" and not exists
+                    ):
+                        self.reply(b"NOT_STORED", noreply)
+                        continue
+                    expire = int(expire)
+                    server.data[key] = (
+                        value,
+                        int(flags),
+                        time.time() + expire if expire else 0,
+                    )
+                    self.reply(b"STORED", noreply)
+                elif command == b"delete":
+                    found = server.data.pop(args[0], None) is not None
+                    self.reply(b"DELETED" if found else b"NOT_FOUND", noreply)
+                elif command in (b"incr", b"decr"):
+                    item = server.live(args[0])
+                    if item is None:
+                        self.reply(b"NOT_FOUND", noreply)
+                        continue
+                    delta = int(args[1]) * (1 if command == b"incr" else -1)
+                    value = str(max(int(item[0]) + delta, 0)).encode()
+                    server.data[args[0]] = (value, item[1], item[2])
+                    self.reply(value, noreply)
+                elif command == b"touch":
+                    item = server.live(args[0])
+                    if item is None:
+                        self.reply(b"NOT_FOUND", noreply)
+                        continue
+                    expire = int(args[1])
+                    server.data[args[0]] = (
+                        item[0],
+                        item[1],
+                        time.time() + expire if expire else 0,
+                    )
+                    self.reply(b"TOUCHED", noreply)
+                elif command == b"flush_all":
+                    server.data.clear()
+                    self.reply(b"OK", noreply)
+                else:
+                    self.reply(b"ERROR")
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("pymemcache"), "pymemcache is not installed"
+)
+class MemcachedBackendTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = MemcachedStandIn()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        host, port = cls.server.server_address
+        cls.enterClassContext(
+            override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": settings.CACHE_BACKENDS["memcached"],
+                        "LOCATION": f"{host}:{port}",
+                        "KEY_PREFIX": "inform_agency",
+                        "VERSION": 3,
+                    }
+                }
+            )
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_operations_used_by_the_app(self) -> None:
+        """
+        Checks the operations the caching layers rely on (add as a lock,
+        get_many, delete_many, incr) against the stand-in server.
+        :return:
+        """
+        cache = caches["default"]
+        cache.set("key", {"value": 1})
+        self.assertEqual(cache.get("key"), {"value": 1})
+        self.assertTrue(cache.add("lock", 1))
+        self.assertFalse(cache.add("lock", 1))
+        self.assertEqual(cache.get_many(["key", "missing"]), {"key": {"value": 1}})
+        cache.set("counter", 1)
+        self.assertEqual(cache.incr("counter"), 2)
+        cache.delete_many(["key", "lock"])
+        self.assertIsNone(cache.get("key"))
+        self.assertIn(b"inform_agency:3:counter", self.server.data)
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers import counters
+from newspapers.models import Counter, Newspaper, Redactor, Topic
+
+INDEX_URL = reverse("newspapers:index")
+
+
+class CounterSignalsTest(TestCase):
+    def setUp(self) -> None:
+        self.topic = Topic.objects.create(name="test_topic")
+
+    def test_counters_follow_create_and_delete(self) -> None:
+        """
+        Checks that saving and deleting objects keeps the counters current,
+        including cascaded deletes.
+        :return:
+        """
+        Newspaper.objects.create(
+            title="test_newspaper",
+            content="test_content",
+            published_date=timezone.now(),
+            topic=self.topic,
+        )
+        get_user_model().objects.create_user(username="test_redactor")
+        self.assertEqual(
+            counters.get_counts(),
+            {Topic: 1, Redactor: 1, Newspaper: 1},
+        )
+        self.topic.delete()
+        self.assertEqual(counters.get_counts()[Newspaper], 0)
+        self.assertEqual(counters.get_counts()[Topic], 0)
+
+    def test_update_does_not_change_counter(self) -> None:
+        self.topic.name = "renamed"
+        self.topic.save()
+        self.assertEqual(counters.get_counts()[Topic], 1)
+
+    def test_counts_are_read_in_one_query(self) -> None:
+        counters.get_counts()
+        with self.assertNumQueries(1):
+            counters.get_counts()
+
+    def test_bulk_create_is_tracked_by_increment(self) -> None:
+        """
+        Checks that bulk writes adjust the counter through counters.increment.
+        :return:
+        """
+        topics = Topic.objects.bulk_create([Topic(name="bulk_1"), Topic(name="bulk_2")])
+        counters.increment(Topic, len(topics))
+        self.assertEqual(counters.get_counts()[Topic], 3)
+
+
+class ReconcileCountersCommandTest(TestCase):
+    def test_reconcile_fixes_drift(self) -> None:
+        """
+        Checks that the reconcile command restores exact counts.
+        :return:
+        """
+        Topic.objects.create(name="test_topic")
+        Counter.objects.filter(name="newspapers.topic").update(value=42)
+        call_command("reconcile_counters", stdout=StringIO())
+        self.assertEqual(counters.get_counts()[Topic], 1)
+
+
+class IndexCountersTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+
+    def test_index_reads_counters(self) -> None:
+        Topic.objects.create(name="test_topic")
+        res = self.client.get(INDEX_URL)
+        self.assertEqual(res.context["num_topics"], 1)
+        self.assertEqual(res.context["num_redactors"], 1)
+        self.assertEqual(res.context["num_newspapers"], 0)
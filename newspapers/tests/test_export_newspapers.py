@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers.models import Newspaper, Redactor, Topic
+
+EXPORT_URL = reverse("newspapers:newspaper-export")
+
+
+def create_newspapers():
+    politics = Topic.objects.create(name="Politics")
+    sport = Topic.objects.create(name="Sport")
+    alice = Redactor.objects.create(username="alice")
+    bob = Redactor.objects.create(username="bob")
+    election = Newspaper.objects.create(
+        title="Election results",
+        content="Votes, counted",
+        published_date=timezone.now(),
+        topic=politics,
+    )
+    election.publishers.set([alice, bob])
+    Newspaper.objects.create(
+        title="Cup final",
+        content="A late goal",
+        published_date=timezone.now(),
+        topic=sport,
+    )
+
+
+class NewspaperExportViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+        create_newspapers()
+
+    def test_login_required(self) -> None:
+        self.client.logout()
+        response = self.client.get(EXPORT_URL)
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_csv_export(self) -> None:
+        """
+        Checks that the CSV export streams a header and one row per
+        newspaper with the topic name and publisher usernames.
+        :return:
+        """
+        response = self.client.get(EXPORT_URL)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("newspapers.csv", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(
+            [row["title"] for row in rows], ["Election results", "Cup final"]
+        )
+        self.assertEqual(rows[0]["topic"], "Politics")
+        self.assertEqual(rows[0]["publishers"], "alice;bob")
+        self.assertEqual(rows[0]["content"], "Votes, counted")
+
+    def test_ndjson_export_honours_list_filters(self) -> None:
+        """
+        Checks that the NDJSON export applies the same topic filter as the
+        newspaper list.
+        :return:
+        """
+        response = self.client.get(EXPORT_URL, {"format": "ndjson", "topic": "sport"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "Cup final")
+        self.assertEqual(rows[0]["publishers"], [])
+
+    def test_unknown_format(self) -> None:
+        response = self.client.get(EXPORT_URL, {"format": "xml"})
+        self.assertEqual(response.status_code, 404)
+
+
+class ExportNewspapersCommandTest(TestCase):
+    def test_export_ndjson(self) -> None:
+        create_newspapers()
+        out = StringIO()
+        call_command("export_newspapers", format="ndjson", chunk_size=1, stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["topic"] for row in rows], ["Politics", "Sport"])
+        self.assertEqual(rows[0]["publishers"], ["alice", "bob"])
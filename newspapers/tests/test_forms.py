@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from newspapers.forms import (
@@ -155,6 +157,62 @@ class NewspaperCreationFormTest(TestCase):
         self.assertTrue(form.is_valid())
 
 
+class NewspaperPublishersWidgetTest(TestCase):
+    def setUp(self) -> None:
+        self.topic = Topic.objects.create(name="test_topic")
+        self.redactors = [
+            Redactor.objects.create(username=f"redactor_{index}") for index in range(5)
+        ]
+
+    def form_data(self, publishers):
+        return {
+            "title": "test_newspaper",
+            "content": "test_content",
+            "published_date": "2025-02-04",
+            "topic": self.topic.id,
+            "publishers": publishers,
+        }
+
+    def test_renders_only_selected_publishers(self) -> None:
+        """
+        Only the selected redactors are rendered as options, the others are
+        loaded through the autocomplete endpoint.
+        :return:
+        """
+        selected = self.redactors[1]
+        form = NewspaperForm(initial={"publishers": [selected.pk]})
+        html = str(form["publishers"])
+        self.assertIn(f'<option value="{selected.pk}" selected>', html)
+        self.assertEqual(html.count("<option"), 1)
+        self.assertIn('data-autocomplete-url="/redactors/autocomplete/"', html)
+        self.assertEqual(str(NewspaperForm()["publishers"]).count("<option"), 0)
+
+    def test_validates_submitted_publishers_in_one_query(self) -> None:
+        """
+        Submitted publisher ids are checked with a single query however many
+        there are.
+        :return:
+        """
+        form = NewspaperForm(data=self.form_data([r.pk for r in self.redactors]))
+        with CaptureQueriesContext(connection) as queries:
+            form.full_clean()
+        self.assertTrue(form.is_valid())
+        redactor_queries = [
+            query for query in queries if "newspapers_redactor" in query["sql"]
+        ]
+        self.assertEqual(len(redactor_queries), 1)
+
+    def test_unknown_publisher_is_invalid(self) -> None:
+        """
+        An id that is not a redactor is rejected and the form still renders.
+        :return:
+        """
+        form = NewspaperForm(data=self.form_data([self.redactors[0].pk, 0, "x"]))
+        self.assertFalse(form.is_valid())
+        self.assertIn("publishers", form.errors)
+        self.assertEqual(str(form["publishers"]).count("<option"), 1)
+
+
 class NewspaperSearchFormTest(TestCase):
     def setUp(self) -> None:
         self.username = get_user_model().objects.create_user(
@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers import fragments
+from newspapers.models import Newspaper, Redactor, Topic
+
+NEWSPAPER_ROW = "includes/newspaper_row.html"
+REDACTOR_ROW = "includes/redactor_row.html"
+
+
+class FragmentCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.science = Topic.objects.create(name="science")
+        self.art = Topic.objects.create(name="art")
+        self.publisher = Redactor.objects.create(
+            username="publisher", first_name="Old", last_name="Name"
+        )
+        self.first = Newspaper.objects.create(
+            title="first",
+            content="content",
+            published_date=timezone.now(),
+            topic=self.science,
+        )
+        self.second = Newspaper.objects.create(
+            title="second",
+            content="content",
+            published_date=timezone.now(),
+            topic=self.art,
+        )
+        self.first.publishers.add(self.publisher)
+
+    def render(self):
+        newspapers = Newspaper.objects.filter(
+            pk__in=[self.first.pk, self.second.pk]
+        ).order_by("pk")
+        return fragments.render_rows(NEWSPAPER_ROW, newspapers, "newspaper")
+
+    def test_rows_are_reused(self) -> None:
+        """
+        A row is rendered once and then served from the cache, even if the
+        object changed without going through the ORM signals.
+        :return:
+        """
+        first_row, second_row = self.render()
+        self.assertIn("first", first_row)
+        Newspaper.objects.filter(pk=self.first.pk).update(title="changed")
+        self.assertEqual(self.render(), [first_row, second_row])
+
+    def test_cached_rows_need_one_query_for_publishers(self) -> None:
+        """
+        Checks that the publisher keys of every row come from one query, or
+        from prefetched publishers without any.
+        :return:
+        """
+        self.render()
+        # The newspapers and their publisher ids.
+        with self.assertNumQueries(2):
+            self.render()
+        newspapers = Newspaper.objects.prefetch_related("publishers").order_by("pk")
+        with self.assertNumQueries(2):
+            rows = fragments.render_rows(NEWSPAPER_ROW, newspapers, "newspaper")
+        self.assertEqual(rows, self.render())
+
+    def test_newspaper_save_purges_its_row(self) -> None:
+        _, second_row = self.render()
+        Newspaper.objects.filter(pk=self.second.pk).update(title="stale")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.title = "updated"
+            self.first.save()
+        first_row, cached_second_row = self.render()
+        self.assertIn("updated", first_row)
+        self.assertEqual(cached_second_row, second_row)
+
+    def test_topic_edit_purges_rows_in_that_topic(self) -> None:
+        """
+        Renaming a topic re-renders only the newspapers of that topic.
+        :return:
+        """
+        _, second_row = self.render()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.science.name = "physics"
+            self.science.save()
+        first_row, cached_second_row = self.render()
+        self.assertIn("physics", first_row)
+        self.assertEqual(cached_second_row, second_row)
+
+    def test_publisher_changes_purge_newspaper_rows(self) -> None:
+        self.render()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publisher.first_name = "New"
+            self.publisher.save()
+        self.assertIn("New Name", self.render()[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publisher.newspapers.add(self.second)
+        self.assertIn("New Name", self.render()[1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.publishers.clear()
+        self.assertIn("No publishers", self.render()[0])
+
+    def test_login_does_not_purge_redactor_rows(self) -> None:
+        key = fragments.surrogate_key(self.publisher)
+        version = fragments.get_versions([key])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publisher.last_login = timezone.now()
+            self.publisher.save(update_fields=["last_login"])
+        self.assertEqual(fragments.get_versions([key]), version)
+
+
+class RedactorListFragmentTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.first = get_user_model().objects.create_user(
+            username="first", password="test123"
+        )
+        self.second = get_user_model().objects.create_user(
+            username="second", password="test123"
+        )
+
+    def test_current_user_row_is_not_shared(self) -> None:
+        """
+        The "(Me)" marker only appears on the logged-in redactor's own row,
+        while the other rows are shared between users.
+        :return:
+        """
+        url = reverse("newspapers:redactor-list")
+        self.client.force_login(self.first)
+        self.assertContains(self.client.get(url), "(Me)", count=1)
+        self.client.force_login(self.second)
+        response = self.client.get(url)
+        self.assertContains(response, "(Me)", count=1)
+        self.assertEqual(response.context["user"], self.second)
+        rows = fragments.render_rows(
+            REDACTOR_ROW, Redactor.objects.order_by("username"), "redactor"
+        )
+        self.assertNotIn("(Me)", "".join(rows))
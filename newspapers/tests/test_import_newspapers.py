@@ -0,0 +1,130 @@
+import io
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from newspapers import counters
+from newspapers.forms import NewspaperForm
+from newspapers.importers import detect_encoding, iter_json_objects
+from newspapers.models import Newspaper, Redactor, Topic
+
+DUMP_PATH = os.path.join(settings.BASE_DIR, "dump.json")
+
+
+class JsonStreamTest(TestCase):
+    def test_detect_encoding(self) -> None:
+        self.assertEqual(detect_encoding("[".encode("utf-16")[:4]), "utf-16")
+        self.assertEqual(detect_encoding("[{".encode("utf-16-le")), "utf-16-le")
+        self.assertEqual(detect_encoding("[{".encode("utf-16-be")), "utf-16-be")
+        self.assertEqual(detect_encoding(b"[{"), "utf-8")
+
+    def test_array_is_parsed_across_chunk_boundaries(self) -> None:
+        objects = [{"pk": index, "text": "x" * index} for index in range(20)]
+        stream = io.StringIO(json.dumps(objects, indent=2))
+        self.assertEqual(list(iter_json_objects(stream, chunk_size=7)), objects)
+
+    def test_ndjson_is_parsed(self) -> None:
+        objects = [{"pk": 1}, {"pk": 2}]
+        stream = io.StringIO("\n".join(json.dumps(obj) for obj in objects))
+        self.assertEqual(list(iter_json_objects(stream, chunk_size=3)), objects)
+
+
+class ImportNewspapersCommandTest(TestCase):
+    def test_import_utf16_dump(self) -> None:
+        """
+        Checks that the UTF-16 seed dump is imported with small batches and
+        transactions, including publishers, and that counters are updated.
+        :return:
+        """
+        out = StringIO()
+        call_command(
+            "import_newspapers",
+            DUMP_PATH,
+            batch_size=4,
+            transaction_size=5,
+            stdout=out,
+        )
+        self.assertEqual(Topic.objects.count(), 10)
+        self.assertEqual(Redactor.objects.count(), 6)
+        self.assertEqual(Newspaper.objects.count(), 11)
+        self.assertEqual(Newspaper.publishers.through.objects.count(), 9)
+        self.assertEqual(Newspaper.objects.get(pk=1).publishers.get().pk, 1)
+        self.assertEqual(counters.get_counts(), {Topic: 10, Redactor: 6, Newspaper: 11})
+        self.assertIn("rows/s", out.getvalue())
+
+    def test_import_ndjson_without_pks(self) -> None:
+        records = [
+            {"model": "newspapers.topic", "pk": 7, "fields": {"name": "Science"}},
+            {
+                "model": "newspapers.newspaper",
+                "fields": {
+                    "title": "New comet",
+                    "content": "Astronomers found a comet",
+                    "published_date": "2025-02-01",
+                    "topic": 7,
+                    "publishers": [],
+                },
+            },
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as f:
+            f.write("\n".join(json.dumps(record) for record in records))
+        self.addCleanup(os.remove, f.name)
+        call_command("import_newspapers", f.name, stdout=StringIO())
+        self.assertEqual(Newspaper.objects.get().topic.name, "Science")
+
+    def test_imported_topics_are_offered_by_forms(self) -> None:
+        """
+        Checks that importing topics replaces an already loaded topic
+        registry, so forms offer the new topics.
+        :return:
+        """
+        self.assertEqual(list(NewspaperForm().fields["topic"].choices)[1:], [])
+        call_command("import_newspapers", DUMP_PATH, stdout=StringIO())
+        choices = list(NewspaperForm().fields["topic"].choices)
+        self.assertEqual(len(choices), 1 + Topic.objects.count())
+        self.assertIn((1, Topic.objects.get(pk=1).name), choices)
+
+    def test_reimport_with_ignore_conflicts(self) -> None:
+        call_command("import_newspapers", DUMP_PATH, stdout=StringIO())
+        call_command(
+            "import_newspapers", DUMP_PATH, ignore_conflicts=True, stdout=StringIO()
+        )
+        self.assertEqual(Newspaper.objects.count(), 11)
+        self.assertEqual(counters.get_counts()[Newspaper], 11)
+
+    def test_ignore_conflicts_reports_inserted_rows(self) -> None:
+        """
+        Checks that with ignore_conflicts only rows the database inserted are
+        counted and publishers of skipped newspapers are not linked.
+        :return:
+        """
+        call_command("import_newspapers", DUMP_PATH, stdout=StringIO())
+        Newspaper.objects.get(pk=1).publishers.clear()
+        Newspaper.objects.filter(pk=2).delete()
+        out = StringIO()
+        call_command("import_newspapers", DUMP_PATH, ignore_conflicts=True, stdout=out)
+        self.assertIn("newspapers.Newspaper: 1\n", out.getvalue())
+        self.assertIn("newspapers.Topic: 0\n", out.getvalue())
+        self.assertFalse(Newspaper.objects.get(pk=1).publishers.exists())
+        links = Newspaper.publishers.through.objects.filter(newspaper_id=2).count()
+        self.assertIn(f"newspapers.Newspaper_publishers: {links}\n", out.getvalue())
+        self.assertEqual(counters.get_counts()[Newspaper], 11)
+
+    def test_ignore_conflicts_refuses_records_without_pk(self) -> None:
+        record = {
+            "model": "newspapers.topic",
+            "fields": {"name": "Science"},
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as f:
+            f.write(json.dumps(record))
+        self.addCleanup(os.remove, f.name)
+        with self.assertRaisesMessage(CommandError, "without a pk"):
+            call_command(
+                "import_newspapers", f.name, ignore_conflicts=True, stdout=StringIO()
+            )
+        self.assertFalse(Topic.objects.exists())
@@ -0,0 +1,184 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from newspapers import metrics, timing
+
+METRICS_URL = reverse("metrics")
+
+WORKER_SCRIPT = """
+from newspapers import metrics
+metrics.REQUEST_LATENCY.labels("newspapers:index", "GET").observe(0.2)
+metrics.REQUEST_ERRORS.labels("newspapers:index", "500").inc()
+"""
+
+
+@modify_settings(
+    MIDDLEWARE={"prepend": "newspapers.middleware.PrometheusMetricsMiddleware"}
+)
+class MetricsEndpointTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+            is_staff=True,
+        )
+        self.client.force_login(self.user)
+
+    def test_metrics_per_url_name(self) -> None:
+        """
+        Checks that a request is exported with its URL name as a label.
+        :return:
+        """
+        self.client.get(reverse("newspapers:topic-list"))
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, 200)
+        body = res.content.decode()
+        self.assertIn(
+            'newspapers_request_latency_seconds_count{method="GET",'
+            'view="newspapers:topic-list"}',
+            body,
+        )
+        self.assertIn(
+            'newspapers_request_db_queries_count{view="newspapers:topic-list"}',
+            body,
+        )
+        self.assertIn(
+            'newspapers_response_size_bytes_count{view="newspapers:topic-list"}',
+            body,
+        )
+
+    def test_unresolved_paths_share_one_label(self) -> None:
+        self.client.get("/no/such/page/")
+        body = self.client.get(METRICS_URL).content.decode()
+        self.assertIn('view="<unresolved>"', body)
+        self.assertNotIn("/no/such/page/", body)
+
+    def test_metrics_denied_by_default(self) -> None:
+        """
+        Checks that anonymous and non-staff users cannot read metrics.
+        :return:
+        """
+        self.client.logout()
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        self.user.is_staff = False
+        self.user.save()
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+    def test_metrics_restricted_by_ip(self) -> None:
+        self.client.logout()
+        with override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"]):
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        with override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"]):
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    def test_metrics_aggregated_across_processes(self) -> None:
+        """
+        Checks that samples written by separate worker processes are
+        summed by the multiprocess collector.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": directory}
+            for _ in range(2):
+                subprocess.run(
+                    [sys.executable, "-c", WORKER_SCRIPT],
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    check=True,
+                )
+            with override_settings(PROMETHEUS_MULTIPROC_DIR=directory):
+                body = self.client.get(METRICS_URL).content.decode()
+        self.assertIn(
+            'newspapers_request_latency_seconds_count{method="GET",'
+            'view="newspapers:index"} 2.0',
+            body,
+        )
+        self.assertIn(
+            'newspapers_request_errors_total{status="500",'
+            'view="newspapers:index"} 2.0',
+            body,
+        )
+
+
+TWO_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "metrics-default",
+    },
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "metrics-fragments",
+    },
+}
+
+
+@override_settings(CACHES=TWO_CACHES)
+class CacheMetricsTest(TestCase):
+    @staticmethod
+    def sample(name, **labels):
+        return metrics.get_registry().get_sample_value(name, labels) or 0
+
+    def test_reads_and_writes_per_alias(self) -> None:
+        """
+        Checks that hits, misses and writes are counted under the alias of
+        the cache they went to.
+        :return:
+        """
+        metrics.install_cache_metrics()
+        before = {
+            (alias, result): self.sample(
+                "newspapers_cache_requests_total", alias=alias, result=result
+            )
+            for alias in TWO_CACHES
+            for result in ("hit", "miss")
+        }
+        sets = self.sample(
+            "newspapers_cache_writes_total", alias="fragments", operation="set"
+        )
+
+        caches["fragments"].set("key", "value")
+        caches["fragments"].get("key")
+        caches["fragments"].get_many(["key", "missing"])
+        caches["default"].get("key")
+
+        def delta(alias, result):
+            return (
+                self.sample(
+                    "newspapers_cache_requests_total", alias=alias, result=result
+                )
+                - before[(alias, result)]
+            )
+
+        self.assertEqual(delta("fragments", "hit"), 2)
+        self.assertEqual(delta("fragments", "miss"), 1)
+        self.assertEqual(delta("default", "hit"), 0)
+        self.assertEqual(delta("default", "miss"), 1)
+        self.assertEqual(
+            self.sample(
+                "newspapers_cache_writes_total", alias="fragments", operation="set"
+            )
+            - sets,
+            1,
+        )
+
+    def test_timing_and_metrics_share_one_hook(self) -> None:
+        """
+        Checks that Server-Timing and Prometheus instrument a backend class
+        with a single wrapper around each method.
+        :return:
+        """
+        metrics.install_cache_metrics()
+        timing.install([LocMemCache])
+        self.assertTrue(LocMemCache.get.newspapers_hooked)
+        self.assertFalse(hasattr(LocMemCache.get.__wrapped__, "newspapers_hooked"))
+        self.assertFalse(hasattr(LocMemCache.set.__wrapped__, "newspapers_hooked"))
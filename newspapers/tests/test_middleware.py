@@ -0,0 +1,113 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, modify_settings, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers.middleware import (
+    NPlusOneDetectionMiddleware,
+    NPlusOneError,
+    fingerprint_sql,
+)
+from newspapers.models import Newspaper, Topic
+
+
+def n_plus_one_view(request):
+    names = [newspaper.topic.name for newspaper in Newspaper.objects.all()]
+    return HttpResponse(", ".join(names))
+
+
+def template_n_plus_one_view(request):
+    template = Template(
+        "{% for newspaper in newspapers %}{{ newspaper.topic.name }}{% endfor %}"
+    )
+    return HttpResponse(
+        template.render(Context({"newspapers": Newspaper.objects.all()}))
+    )
+
+
+def select_related_view(request):
+    queryset = Newspaper.objects.select_related("topic")
+    return HttpResponse(", ".join(n.topic.name for n in queryset))
+
+
+@override_settings(NPLUSONE_ENABLED=True, NPLUSONE_SAMPLE_RATE=1.0, NPLUSONE_RAISE=True)
+class NPlusOneDetectionMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        self.request = RequestFactory().get("/newspapers/")
+        for index in range(5):
+            topic = Topic.objects.create(name=f"topic_{index}")
+            Newspaper.objects.create(
+                title=f"newspaper_{index}",
+                content="test_content",
+                published_date=timezone.now(),
+                topic=topic,
+            )
+
+    def test_repeated_query_from_code_is_detected(self) -> None:
+        """
+        Checks that a lazy foreign key access in a loop raises with the call site.
+        :return:
+        """
+        middleware = NPlusOneDetectionMiddleware(n_plus_one_view)
+        with self.assertRaisesMessage(NPlusOneError, "test_middleware.py"):
+            middleware(self.request)
+
+    def test_repeated_query_from_template_is_detected(self) -> None:
+        middleware = NPlusOneDetectionMiddleware(template_n_plus_one_view)
+        with self.assertRaisesMessage(NPlusOneError, "<unknown source>:1"):
+            middleware(self.request)
+
+    def test_select_related_passes(self) -> None:
+        middleware = NPlusOneDetectionMiddleware(select_related_view)
+        self.assertEqual(middleware(self.request).status_code, 200)
+
+    @override_settings(NPLUSONE_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_instrumented(self) -> None:
+        middleware = NPlusOneDetectionMiddleware(n_plus_one_view)
+        self.assertEqual(middleware(self.request).status_code, 200)
+
+    def test_fingerprint_collapses_in_lists(self) -> None:
+        self.assertEqual(
+            fingerprint_sql("SELECT 1 WHERE id IN (%s, %s,\n %s)"),
+            fingerprint_sql("SELECT 1 WHERE id IN (%s)"),
+        )
+
+
+@override_settings(SERVER_TIMING_ENABLED=True)
+@modify_settings(MIDDLEWARE={"prepend": "newspapers.middleware.ServerTimingMiddleware"})
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+        Topic.objects.create(name="test_topic")
+
+    def test_server_timing_header(self) -> None:
+        """
+        Checks that the response carries DB, template, cache and view timings
+        keyed by the URL name.
+        :return:
+        """
+        res = self.client.get(reverse("newspapers:topic-list"))
+        header = res["Server-Timing"]
+        self.assertIn("db;dur=", header)
+        self.assertIn("tpl;dur=", header)
+        self.assertIn("cache;desc=", header)
+        self.assertIn('desc="newspapers:topic-list"', header)
+
+    def test_structured_log_line(self) -> None:
+        with self.assertLogs("newspapers.timing", "INFO") as logs:
+            self.client.get(reverse("newspapers:topic-list"))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "newspapers:topic-list")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["db_queries"], 0)
+        self.assertGreater(record["template_ms"], 0)
+        self.assertGreaterEqual(record["total_ms"], record["template_ms"])
+        self.assertGreaterEqual(record["cache_hits"] + record["cache_misses"], 1)
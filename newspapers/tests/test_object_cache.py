@@ -0,0 +1,167 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers import object_cache
+from newspapers.models import Newspaper, Redactor, Topic
+
+
+class ObjectCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.topic = Topic.objects.create(name="test_topic")
+        self.publisher = Redactor.objects.create(
+            username="publisher", first_name="Old", last_name="Name"
+        )
+        self.newspaper = Newspaper.objects.create(
+            title="test_newspaper",
+            content="test_content",
+            published_date=timezone.now(),
+            topic=self.topic,
+        )
+        self.newspaper.publishers.add(self.publisher)
+
+    def test_newspaper_is_read_through(self) -> None:
+        """
+        The second read of a newspaper, its topic and publishers needs no
+        query.
+        :return:
+        """
+        object_cache.get_newspaper(self.newspaper.pk)
+        with self.assertNumQueries(0):
+            newspaper = object_cache.get_newspaper(self.newspaper.pk)
+            self.assertEqual(newspaper.topic.name, "test_topic")
+            self.assertEqual(list(newspaper.publishers.all()), [self.publisher])
+
+    def test_missing_object_raises(self) -> None:
+        with self.assertRaises(Newspaper.DoesNotExist):
+            object_cache.get_newspaper(0)
+        with self.assertRaises(Redactor.DoesNotExist):
+            object_cache.get_redactor(0)
+
+    def test_newspaper_save_invalidates(self) -> None:
+        object_cache.get_newspaper(self.newspaper.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.title = "updated"
+            self.newspaper.save()
+        self.assertEqual(object_cache.get_newspaper(self.newspaper.pk).title, "updated")
+
+    def test_publishers_change_invalidates_both_sides(self) -> None:
+        """
+        Adding, removing and clearing publishers from either side refreshes
+        the newspaper and the redactors' newspaper counts.
+        :return:
+        """
+        other = Redactor.objects.create(username="other")
+        object_cache.get_newspaper(self.newspaper.pk)
+        self.assertEqual(object_cache.get_redactor(other.pk).newspaper_count, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.publishers.add(other)
+        newspaper = object_cache.get_newspaper(self.newspaper.pk)
+        self.assertEqual(len(newspaper.publishers.all()), 2)
+        self.assertEqual(object_cache.get_redactor(other.pk).newspaper_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.newspapers.remove(self.newspaper)
+        newspaper = object_cache.get_newspaper(self.newspaper.pk)
+        self.assertEqual(len(newspaper.publishers.all()), 1)
+        self.assertEqual(object_cache.get_redactor(other.pk).newspaper_count, 0)
+
+        object_cache.get_redactor(self.publisher.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.publishers.clear()
+        self.assertEqual(
+            object_cache.get_redactor(self.publisher.pk).newspaper_count, 0
+        )
+
+    def test_redactor_save_invalidates_their_newspapers(self) -> None:
+        object_cache.get_newspaper(self.newspaper.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.publisher.first_name = "New"
+            self.publisher.save()
+        newspaper = object_cache.get_newspaper(self.newspaper.pk)
+        self.assertEqual(newspaper.publishers.all()[0].first_name, "New")
+        self.assertEqual(object_cache.get_redactor(self.publisher.pk).first_name, "New")
+
+    def test_deletes_invalidate_related_objects(self) -> None:
+        object_cache.get_newspaper(self.newspaper.pk)
+        self.assertEqual(
+            object_cache.get_redactor(self.publisher.pk).newspaper_count, 1
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.delete()
+        self.assertEqual(
+            object_cache.get_redactor(self.publisher.pk).newspaper_count, 0
+        )
+        with self.assertRaises(Newspaper.DoesNotExist):
+            object_cache.get_newspaper(self.newspaper.pk)
+
+    def test_detail_views_use_cache(self) -> None:
+        user = get_user_model().objects.create_user(username="user", password="pw")
+        self.client.force_login(user)
+        for url in (
+            reverse("newspapers:newspaper-detail", args=[self.newspaper.pk]),
+            reverse("newspapers:redactor-detail", args=[self.publisher.pk]),
+        ):
+            with self.subTest(url=url):
+                self.client.get(url)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.get(
+                reverse("newspapers:newspaper-detail", args=[0])
+            ).status_code,
+            404,
+        )
+
+
+class StampedeProtectionTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_concurrent_misses_load_once(self) -> None:
+        """
+        Threads missing the same key at once trigger a single load.
+        :return:
+        """
+        loads = []
+
+        def loader():
+            loads.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    object_cache.get_or_load("test:key", loader)
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_waits_for_another_worker(self) -> None:
+        """
+        While another worker holds the lock key, the value it stores is
+        returned instead of loading again.
+        :return:
+        """
+        cache.add("test:key:lock", 1)
+        timer = threading.Timer(0.1, cache.set, ["test:key", "from worker"])
+        timer.start()
+        value = object_cache.get_or_load("test:key", self.fail)
+        timer.join()
+        self.assertEqual(value, "from worker")
@@ -0,0 +1,165 @@
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from newspapers.models import Newspaper, Topic
+from newspapers.pagination import (
+    CursorPaginator,
+    EstimatedCountPaginator,
+    InvalidCursor,
+    estimate_count,
+)
+
+TOPIC_URL = reverse("newspapers:topic-list")
+
+
+class CursorPaginatorTest(TestCase):
+    def setUp(self) -> None:
+        for index in range(7):
+            Topic.objects.create(name=f"topic_{index}")
+
+    def test_pages_follow_ordering_without_gaps(self) -> None:
+        """
+        Walking the next cursors visits every row exactly once, in order.
+        :return:
+        """
+        paginator = CursorPaginator(Topic.objects.order_by("name"), 3)
+        names = []
+        cursor = None
+        while True:
+            page = paginator.page(cursor)
+            names.extend(topic.name for topic in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(names, [f"topic_{index}" for index in range(7)])
+
+    def test_previous_cursor_returns_previous_page(self) -> None:
+        """
+        The previous cursor of the second page leads back to the first page.
+        :return:
+        """
+        paginator = CursorPaginator(Topic.objects.order_by("name"), 3)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+        self.assertFalse(first.has_previous())
+        self.assertTrue(second.has_previous())
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_deep_page_does_not_count(self) -> None:
+        """
+        A page is fetched with a single LIMIT query and no COUNT(*).
+        :return:
+        """
+        paginator = CursorPaginator(Topic.objects.order_by("name"), 3)
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(1) as context:
+            paginator.page(cursor)
+        self.assertNotIn("COUNT", context.captured_queries[0]["sql"].upper())
+
+    def test_tampered_cursor_is_rejected(self) -> None:
+        paginator = CursorPaginator(Topic.objects.order_by("name"), 3)
+        with self.assertRaises(InvalidCursor):
+            paginator.page("not-a-cursor")
+
+
+class CursorPaginationViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+        for index in range(5):
+            Topic.objects.create(name=f"topic_{index}")
+
+    def test_list_view_uses_cursor_pagination(self) -> None:
+        res = self.client.get(TOPIC_URL)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.context["cursor_pagination"])
+        self.assertEqual(len(res.context["topic_list"]), 3)
+        next_cursor = res.context["page_obj"].next_cursor
+        res = self.client.get(TOPIC_URL, {"cursor": next_cursor})
+        self.assertEqual(
+            [topic.name for topic in res.context["topic_list"]],
+            ["topic_3", "topic_4"],
+        )
+
+    @override_settings(CURSOR_PAGINATION_MAX_PAGE_SIZE=4)
+    def test_page_size_is_capped(self) -> None:
+        res = self.client.get(TOPIC_URL, {"page_size": 1000})
+        self.assertEqual(len(res.context["topic_list"]), 4)
+
+    def test_invalid_cursor_returns_404(self) -> None:
+        res = self.client.get(TOPIC_URL, {"cursor": "broken"})
+        self.assertEqual(res.status_code, 404)
+
+    def test_page_number_links_use_estimated_count_paginator(self) -> None:
+        cache.clear()
+        res = self.client.get(TOPIC_URL, {"page": 2})
+        self.assertFalse(res.context["cursor_pagination"])
+        self.assertIsInstance(res.context["paginator"], EstimatedCountPaginator)
+        self.assertEqual(res.context["page_obj"].number, 2)
+        self.assertEqual(len(res.context["topic_list"]), 2)
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        for index in range(7):
+            Topic.objects.create(name=f"topic_{index}")
+
+    def test_small_result_is_counted_exactly_and_cached(self) -> None:
+        """
+        Below the threshold the count is exact, and querysets that only
+        differ in ordering reuse the cached count.
+        :return:
+        """
+        self.assertEqual(EstimatedCountPaginator(Topic.objects.all(), 3).count, 7)
+        with self.assertNumQueries(0):
+            paginator = EstimatedCountPaginator(Topic.objects.order_by("-name"), 3)
+            self.assertEqual(paginator.count, 7)
+
+    def test_counts_are_cached_per_filter(self) -> None:
+        queryset = Topic.objects.filter(name__in=["topic_1", "topic_2"])
+        self.assertEqual(EstimatedCountPaginator(queryset, 3).count, 2)
+        self.assertEqual(EstimatedCountPaginator(Topic.objects.all(), 3).count, 7)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_large_estimate_is_used_instead_of_count(self) -> None:
+        with mock.patch(
+            "newspapers.pagination.estimate_count", return_value=50000
+        ), self.assertNumQueries(0):
+            paginator = EstimatedCountPaginator(Topic.objects.all(), 3)
+            self.assertEqual(paginator.count, 50000)
+        self.assertEqual(paginator.num_pages, 16667)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_small_estimate_falls_back_to_exact_count(self) -> None:
+        with mock.patch("newspapers.pagination.estimate_count", return_value=12):
+            paginator = EstimatedCountPaginator(Topic.objects.all(), 3)
+            self.assertEqual(paginator.count, 7)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "Estimates need Postgres")
+    def test_table_estimate_sums_partitions(self) -> None:
+        """
+        Checks that an unfiltered estimate is read from the statistics of the
+        table, or of its partitions when the table is partitioned.
+        :return:
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE newspapers_topic")
+            cursor.execute("ANALYZE newspapers_newspaper")
+        self.assertIsNotNone(estimate_count(Topic.objects.all()))
+        self.assertIsNotNone(estimate_count(Newspaper.objects.all()))
+
+    def test_empty_queryset(self) -> None:
+        with self.assertNumQueries(0):
+            self.assertEqual(EstimatedCountPaginator(Topic.objects.none(), 3).count, 0)
@@ -0,0 +1,167 @@
+import datetime
+import unittest
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from newspapers import partitions
+from newspapers.models import Newspaper, Redactor, Topic
+
+
+class PartitionPeriodTest(SimpleTestCase):
+    def test_monthly_periods(self) -> None:
+        starts = list(
+            partitions.iter_periods(
+                datetime.date(2023, 11, 15), datetime.date(2024, 2, 1), "month"
+            )
+        )
+        self.assertEqual(
+            starts,
+            [
+                datetime.date(2023, 11, 1),
+                datetime.date(2023, 12, 1),
+                datetime.date(2024, 1, 1),
+                datetime.date(2024, 2, 1),
+            ],
+        )
+        self.assertEqual(
+            partitions.partition_name(starts[1], "month"),
+            "newspapers_newspaper_p2023_12",
+        )
+
+    def test_yearly_periods(self) -> None:
+        starts = list(
+            partitions.iter_periods(
+                datetime.date(2023, 6, 1), datetime.date(2024, 1, 1), "year"
+            )
+        )
+        self.assertEqual(starts, [datetime.date(2023, 1, 1), datetime.date(2024, 1, 1)])
+        self.assertEqual(
+            partitions.next_period(starts[-1], "year"), datetime.date(2025, 1, 1)
+        )
+        self.assertEqual(
+            partitions.partition_name(starts[0], "year"), "newspapers_newspaper_p2023"
+        )
+
+    @override_settings(NEWSPAPER_PARTITIONING="week")
+    def test_unknown_interval(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            partitions.get_interval()
+
+    @override_settings(NEWSPAPER_PARTITIONS_AHEAD=5)
+    def test_partitions_ahead_setting(self) -> None:
+        self.assertEqual(partitions.get_partitions_ahead(), 5)
+
+
+class SQLitePartitioningTest(TestCase):
+    def test_sqlite_keeps_a_plain_table(self) -> None:
+        """
+        Checks that the partitioning migration leaves the SQLite table alone
+        and that the partition command refuses to run against it.
+        :return:
+        """
+        self.assertFalse(partitions.is_partitioned(connection))
+        with override_settings(NEWSPAPER_PARTITIONING="month"):
+            with self.assertRaisesMessage(CommandError, "is not partitioned"):
+                call_command("create_newspaper_partitions")
+            with self.assertRaisesMessage(CommandError, "only supported on Postgres"):
+                call_command("partition_newspapers")
+
+    def test_command_requires_setting(self) -> None:
+        with override_settings(NEWSPAPER_PARTITIONING=None):
+            with self.assertRaisesMessage(CommandError, "is not set"):
+                call_command("create_newspaper_partitions")
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Partitioning needs Postgres")
+class PostgresPartitioningTest(TestCase):
+    def setUp(self) -> None:
+        self.redactor = Redactor.objects.create_user(username="test_user")
+        topic = Topic.objects.create(name="test_topic")
+        self.old = Newspaper.objects.create(
+            title="Old",
+            content="Old news",
+            published_date=datetime.date(2023, 11, 15),
+            topic=topic,
+        )
+        self.old.publishers.add(self.redactor)
+        self.recent = Newspaper.objects.create(
+            title="Recent",
+            content="Recent news",
+            published_date=datetime.date(2024, 1, 10),
+            topic=topic,
+        )
+
+    def inbound_foreign_keys(self) -> list:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname FROM pg_constraint "
+                "WHERE confrelid = %s::regclass AND contype = 'f'",
+                [partitions.TABLE],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def check_constraints(self) -> list:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'c' ORDER BY conname",
+                [partitions.TABLE],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def partition_exists(self, name) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            return cursor.fetchone()[0] is not None
+
+    def test_partition_and_revert(self) -> None:
+        """
+        Checks that rows, publishers and the id sequence survive converting
+        the table to monthly partitions and back, that check constraints
+        are kept, and that the inbound foreign key is dropped and restored
+        under its original name.
+        :return:
+        """
+        foreign_keys = self.inbound_foreign_keys()
+        checks = self.check_constraints()
+        self.assertTrue(checks)
+        call_command("partition_newspapers", interval="month", stdout=StringIO())
+        self.assertTrue(partitions.is_partitioned(connection))
+        for start in partitions.iter_periods(
+            self.old.published_date, self.recent.published_date, "month"
+        ):
+            self.assertTrue(
+                self.partition_exists(partitions.partition_name(start, "month"))
+            )
+        self.assertEqual(partitions.default_partition_rows(connection), 0)
+        self.assertEqual(self.inbound_foreign_keys(), [])
+        self.assertEqual(self.check_constraints(), checks)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Newspaper.objects.filter(pk=self.old.pk).update(word_count=-1)
+        self.assertEqual(
+            Newspaper.objects.get(pk=self.old.pk).publishers.get(), self.redactor
+        )
+        created = Newspaper.objects.create(
+            title="New",
+            content="New news",
+            published_date=datetime.date.today(),
+        )
+        self.assertGreater(created.pk, self.recent.pk)
+        with self.assertRaisesMessage(CommandError, "already partitioned"):
+            call_command("partition_newspapers", interval="month")
+
+        call_command("partition_newspapers", revert=True, stdout=StringIO())
+        self.assertFalse(partitions.is_partitioned(connection))
+        self.assertEqual(self.inbound_foreign_keys(), foreign_keys)
+        self.assertEqual(self.check_constraints(), checks)
+        self.assertEqual(Newspaper.objects.count(), 3)
+        self.assertGreater(
+            Newspaper.objects.create(
+                title="Later", content="", published_date=datetime.date.today()
+            ).pk,
+            created.pk,
+        )
@@ -0,0 +1,242 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers.models import Newspaper, Redactor, Topic
+
+SQLITE_SCAN = re.compile(r"SCAN (\w+)(?: USING INDEX (\w+))?")
+POSTGRES_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+SUBQUERY_ALIAS = re.compile(r'"(\w+)" (U\d+)\b')
+OUTER_TABLE = re.compile(r' FROM "(\w+)"')
+OUTER_ORDER = re.compile(r" ORDER BY (.*?)(?: LIMIT |$)")
+
+
+def query_plan(sql, params=None):
+    """
+    Lines of the query plan the database chooses for ``sql``
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Seeded tables are small, so make the planner prefer any index.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+        else:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def top_level(sql):
+    """
+    ``sql`` with every parenthesized part (subqueries, function calls)
+    blanked out, so only the clauses of the outermost query remain
+    """
+    depth = 0
+    chars = []
+    for char in sql:
+        if char == "(":
+            depth += 1
+        chars.append(char if depth == 0 else " ")
+        if char == ")":
+            depth -= 1
+    return "".join(chars)
+
+
+def limit_stops_scan(sql):
+    """
+    Table whose bare SQLite scan stops after LIMIT rows: the outermost
+    table of a query without WHERE, ordered by nothing or by its primary
+    key (the order the table itself is stored in)
+    """
+    outer = top_level(sql)
+    if " LIMIT " not in outer or " WHERE " in outer:
+        return None
+    match = OUTER_TABLE.search(outer)
+    if match is None:
+        return None
+    table = match.group(1)
+    order = OUTER_ORDER.search(outer)
+    if order and not re.fullmatch(
+        rf'"{table}"\."id"(?: ASC| DESC)?', order.group(1).strip()
+    ):
+        return None
+    return table
+
+
+def sequential_scans(sql):
+    """
+    Tables that the plan of ``sql`` reads with a full sequential scan
+    """
+    plan = query_plan(sql)
+    if connection.vendor == "postgresql":
+        return POSTGRES_SEQ_SCAN.findall("\n".join(plan))
+
+    sorted_afterwards = any(
+        line.startswith("USE TEMP B-TREE FOR ORDER BY") for line in plan
+    )
+    # A scan in rowid order that feeds LIMIT directly stops after LIMIT rows,
+    # like an index scan on the primary key.
+    limited = None if sorted_afterwards else limit_stops_scan(sql)
+    aliases = {alias: table for table, alias in SUBQUERY_ALIAS.findall(sql)}
+    scans = []
+    for line in plan:
+        match = SQLITE_SCAN.fullmatch(line)
+        if not match:
+            continue
+        table, index = match.groups()
+        # Walking a whole non-covering index and sorting the rows afterwards
+        # reads every row, just in a worse order than the table itself.
+        if (index is None and table != limited) or (index and sorted_afterwards):
+            scans.append(aliases.get(table, table))
+    return scans
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Assertions that fail when a request falls back to a sequential scan.
+
+    SQLite cannot index infix ``LIKE`` patterns, so substring searches pass
+    the searched table in ``sqlite_unindexed``; Postgres serves them from
+    trigram indexes and is always checked.
+    """
+
+    def assertNoSequentialScan(self, sql, sqlite_unindexed=()):
+        scans = sequential_scans(sql)
+        if connection.vendor == "sqlite":
+            scans = [table for table in scans if table not in sqlite_unindexed]
+        self.assertFalse(scans, f"Sequential scan on {', '.join(scans)}: {sql}")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = "\n".join(query_plan(*queryset.query.sql_with_params()))
+        self.assertIn(index_name, plan, f"{index_name} not used: {plan}")
+
+    def assertRequestUsesIndexes(self, url, data=None, sqlite_unindexed=()):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertTrue(selects)
+        for sql in selects:
+            with self.subTest(url=url, data=data, sql=sql):
+                self.assertNoSequentialScan(sql, sqlite_unindexed)
+        return response
+
+
+class ListQueryPlanTest(QueryPlanAssertionsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        topics = [Topic.objects.create(name=f"topic_{index}") for index in range(5)]
+        redactors = [
+            Redactor.objects.create(username=f"redactor_{index}") for index in range(5)
+        ]
+        for index in range(60):
+            newspaper = Newspaper.objects.create(
+                title=f"Headline {index}",
+                content=f"Story number {index} about elections",
+                published_date=timezone.now() - timezone.timedelta(days=index),
+                topic=topics[index % len(topics)],
+            )
+            newspaper.publishers.set(redactors[index % 3 : index % 3 + 2])
+        cls.topic = topics[0]
+        cls.admin = get_user_model().objects.create_superuser(
+            username="admin", password="test_admin"
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.admin)
+
+    def test_newspaper_list(self) -> None:
+        url = reverse("newspapers:newspaper-list")
+        response = self.assertRequestUsesIndexes(url)
+        self.assertRequestUsesIndexes(
+            url, {"cursor": response.context["page_obj"].next_cursor}
+        )
+        self.assertRequestUsesIndexes(
+            url, {"topic": "topic_1"}, sqlite_unindexed=("newspapers_topic",)
+        )
+        self.assertRequestUsesIndexes(url, {"q": "elections"})
+
+    def test_newspaper_archive(self) -> None:
+        today = timezone.now().date()
+        self.assertRequestUsesIndexes(
+            reverse("newspapers:newspaper-archive-year", args=[today.year])
+        )
+        self.assertRequestUsesIndexes(
+            reverse(
+                "newspapers:newspaper-archive-month", args=[today.year, today.month]
+            )
+        )
+
+    def test_newspaper_export(self) -> None:
+        url = reverse("newspapers:newspaper-export")
+        self.assertRequestUsesIndexes(
+            url, {"topic": "topic_1"}, sqlite_unindexed=("newspapers_topic",)
+        )
+
+    def test_redactor_list(self) -> None:
+        url = reverse("newspapers:redactor-list")
+        response = self.assertRequestUsesIndexes(url)
+        self.assertRequestUsesIndexes(
+            url, {"cursor": response.context["page_obj"].next_cursor}
+        )
+        self.assertRequestUsesIndexes(url, {"username": "redactor_1"})
+
+    def test_redactor_autocomplete(self) -> None:
+        self.assertRequestUsesIndexes(
+            reverse("newspapers:redactor-autocomplete"), {"q": "redactor_"}
+        )
+
+    def test_topic_list(self) -> None:
+        url = reverse("newspapers:topic-list")
+        self.assertRequestUsesIndexes(url)
+        self.assertRequestUsesIndexes(
+            url, {"name": "topic_1"}, sqlite_unindexed=("newspapers_topic",)
+        )
+
+    def test_newspaper_admin_changelist(self) -> None:
+        url = reverse("admin:newspapers_newspaper_changelist")
+        self.assertRequestUsesIndexes(url)
+        self.assertRequestUsesIndexes(url, {"topic__id__exact": self.topic.pk})
+        self.assertRequestUsesIndexes(url, {"o": "-4"})
+
+    def test_composite_indexes(self) -> None:
+        """
+        Newspapers of one topic in date order and all newspapers in date
+        order are read from the composite indexes.
+        :return:
+        """
+        self.assertUsesIndex(
+            Newspaper.objects.filter(topic=self.topic).order_by("published_date", "id")[
+                :20
+            ],
+            "newspaper_topic_date_id_idx",
+        )
+        self.assertUsesIndex(
+            Newspaper.objects.order_by("-published_date", "-id")[:20],
+            "newspaper_date_id_idx",
+        )
+
+    def test_only_unfiltered_primary_key_scans_are_limited(self) -> None:
+        """
+        A rowid-ordered scan feeding LIMIT is not reported, but a filtered
+        one under LIMIT still reads every row and is.
+        :return:
+        """
+        unfiltered = Newspaper.objects.order_by("id")[:20]
+        filtered = Newspaper.objects.filter(word_count__gt=F("reading_time"))[:20]
+        self.assertEqual(sequential_scans(str(unfiltered.query)), [])
+        if connection.vendor == "sqlite":
+            self.assertEqual(
+                sequential_scans(str(filtered.query)), ["newspapers_newspaper"]
+            )
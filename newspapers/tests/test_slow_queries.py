@@ -0,0 +1,77 @@
+import json
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from newspapers import slow_queries
+from newspapers.models import Topic
+
+LOG_EVERYTHING = override_settings(
+    SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1.0
+)
+
+
+class SlowQueryLoggerTest(TestCase):
+    def setUp(self) -> None:
+        wrapper = slow_queries.slow_query_logger
+        if wrapper not in connection.execute_wrappers:
+            slow_queries.install_wrapper(connection)
+            self.addCleanup(connection.execute_wrappers.remove, wrapper)
+
+    def test_slow_query_is_logged_with_call_site(self) -> None:
+        """
+        Checks that a query above the threshold is logged with its
+        normalized SQL and the line of code that issued it.
+        :return:
+        """
+        with LOG_EVERYTHING, self.assertLogs(
+            "newspapers.slow_queries", "WARNING"
+        ) as logs:
+            list(Topic.objects.filter(id__in=[1, 2, 3]))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertIn("test_slow_queries.py", record["call_site"])
+        self.assertIn("IN (%s, ...)", record["sql"])
+        self.assertIsNone(record["view"])
+        self.assertIsNone(record["explain"])
+
+    def test_fast_query_is_not_logged(self) -> None:
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=60_000), self.assertNoLogs(
+            "newspapers.slow_queries", "WARNING"
+        ):
+            list(Topic.objects.all())
+
+    def test_unsampled_query_is_not_logged(self) -> None:
+        with override_settings(
+            SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=0.0
+        ), self.assertNoLogs("newspapers.slow_queries", "WARNING"):
+            list(Topic.objects.all())
+
+    @modify_settings(
+        MIDDLEWARE={"prepend": "newspapers.middleware.SlowQueryContextMiddleware"}
+    )
+    def test_slow_query_is_attributed_to_view(self) -> None:
+        user = get_user_model().objects.create_user(username="test_user")
+        self.client.force_login(user)
+        with LOG_EVERYTHING, self.assertLogs(
+            "newspapers.slow_queries", "WARNING"
+        ) as logs:
+            self.client.get(reverse("newspapers:topic-list"))
+        views = {json.loads(r.getMessage())["view"] for r in logs.records}
+        self.assertIn("newspapers:topic-list", views)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN runs on Postgres")
+    def test_failed_explain_keeps_transaction_usable(self) -> None:
+        """
+        Checks that a failing EXPLAIN inside an atomic block does not abort
+        the caller's transaction.
+        :return:
+        """
+        with transaction.atomic():
+            plan = slow_queries.explain(
+                connection, "SELECT no_such_column FROM newspapers_topic", []
+            )
+            self.assertTrue(plan[0].startswith("EXPLAIN failed"))
+            self.assertEqual(Topic.objects.count(), 0)
@@ -0,0 +1,136 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from newspapers import topics
+from newspapers.forms import NewspaperForm
+from newspapers.models import Newspaper, Topic
+
+NEWSPAPER_URL = reverse("newspapers:newspaper-list")
+
+
+class TopicRegistryTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.science = Topic.objects.create(name="science")
+        self.art = Topic.objects.create(name="art")
+
+    def test_choices_are_ordered_by_name(self) -> None:
+        registry = topics.get_registry()
+        self.assertEqual(
+            registry.choices, [(self.art.pk, "art"), (self.science.pk, "science")]
+        )
+        self.assertEqual(registry.get(self.art.pk), self.art)
+        self.assertEqual(registry.get(self.art.pk).name, "art")
+        self.assertIsNone(registry.get(0))
+
+    def test_registry_is_served_without_queries(self) -> None:
+        """
+        Once loaded, the registry is read from the process without touching
+        the database, even after the process copy is gone.
+        :return:
+        """
+        topics.get_registry()
+        with self.assertNumQueries(0):
+            topics.get_registry()
+        topics._local["version"] = None
+        with self.assertNumQueries(0):
+            topics.get_registry()
+
+    def test_save_and_delete_invalidate(self) -> None:
+        """
+        Saving or deleting a topic changes the shared version, so every
+        worker reloads its copy.
+        :return:
+        """
+        version = topics._current_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Topic.objects.create(name="politics")
+        self.assertNotEqual(topics._current_version(), version)
+        self.assertIn("politics", dict(topics.get_registry().choices).values())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.art.name = "arts"
+            self.art.save()
+        self.assertEqual(topics.get_registry().names[self.art.pk], "arts")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.science.delete()
+        self.assertNotIn(self.science.pk, topics.get_registry())
+
+    def test_stale_worker_reloads(self) -> None:
+        """
+        A process holding an older version ignores it once another worker
+        bumps the shared version key.
+        :return:
+        """
+        topics.get_registry()
+        Topic.objects.filter(pk=self.art.pk).update(name="arts")
+        cache.set(topics.VERSION_CACHE_KEY, "other-worker")
+        self.assertEqual(topics.get_registry().names[self.art.pk], "arts")
+
+
+class TopicRegistryUsageTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.topic = Topic.objects.create(name="science")
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test123"
+        )
+        self.client.force_login(self.user)
+
+    def test_form_choices_and_validation_use_registry(self) -> None:
+        topics.get_registry()
+        with self.assertNumQueries(0):
+            html = str(NewspaperForm()["topic"])
+        self.assertIn(f'<option value="{self.topic.pk}">science</option>', html)
+
+        form = NewspaperForm(
+            data={
+                "title": "title",
+                "content": "content",
+                "published_date": "2025-02-04",
+                "topic": self.topic.pk,
+            }
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(form.is_valid())
+        # Only the model's own foreign key check reads the table, by pk.
+        topic_queries = [
+            query["sql"] for query in queries if "newspapers_topic" in query["sql"]
+        ]
+        self.assertEqual(len(topic_queries), 1)
+        self.assertIn('WHERE "newspapers_topic"."id" =', topic_queries[0])
+        self.assertEqual(form.cleaned_data["topic"], self.topic)
+
+    def test_unknown_topic_is_invalid(self) -> None:
+        form = NewspaperForm(
+            data={
+                "title": "title",
+                "content": "content",
+                "published_date": "2025-02-04",
+                "topic": 0,
+            }
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("topic", form.errors)
+
+    def test_list_renders_topics_without_joining(self) -> None:
+        for index in range(3):
+            Newspaper.objects.create(
+                title=f"title {index}",
+                content="content",
+                published_date=timezone.now(),
+                topic=self.topic,
+            )
+        topics.get_registry()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(NEWSPAPER_URL)
+        self.assertContains(response, "<td>science</td>", count=3)
+        self.assertFalse(
+            [query for query in queries if "newspapers_topic" in query["sql"]]
+        )
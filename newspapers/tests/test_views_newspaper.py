@@ -1,8 +1,15 @@
+import datetime
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from newspapers import archive, search
 from newspapers.models import Topic, Newspaper, Redactor
 
 TOPIC_URL = reverse("newspapers:topic-list")
@@ -60,6 +67,7 @@ class PrivateNewspaperTest(TestCase):
 
 class NewspaperListViewTest(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="test_user",
             password="test123",
@@ -199,3 +207,268 @@ class NewspaperUpdateViewTest(TestCase):
         print(res.content.decode())
         self.assertEqual(newspaper.title, "Updated title")
         self.assertEqual(res.status_code, 302)
+
+
+class NewspaperFullTextSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+        topic = Topic.objects.create(name="test_topic")
+        self.in_title = Newspaper.objects.create(
+            title="Election results",
+            content="Counting is over",
+            published_date=timezone.now(),
+            topic=topic,
+        )
+        self.in_content = Newspaper.objects.create(
+            title="Morning digest",
+            content="The election campaign starts today",
+            published_date=timezone.now(),
+            topic=topic,
+        )
+        Newspaper.objects.create(
+            title="Weather",
+            content="Sunny and warm",
+            published_date=timezone.now(),
+            topic=topic,
+        )
+
+    def test_search_matches_title_and_content_ranked(self) -> None:
+        """
+        Checks that full-text search finds words in title and content and
+        ranks title matches first.
+        :return:
+        """
+        res = self.client.get(NEWSPAPER_URL, {"q": "election"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            list(res.context["newspaper_list"]), [self.in_title, self.in_content]
+        )
+
+    def test_search_follows_updates(self) -> None:
+        """
+        Checks that the search index is kept in sync when a newspaper is edited.
+        :return:
+        """
+        self.in_content.content = "Nothing to see"
+        self.in_content.save()
+        res = self.client.get(NEWSPAPER_URL, {"q": "election"})
+        self.assertEqual(list(res.context["newspaper_list"]), [self.in_title])
+
+    def test_triggers_are_restored_after_migrate(self) -> None:
+        """
+        Checks that triggers dropped by a SQLite table rebuild are re-created
+        after migrate and the writes they missed are indexed.
+        :return:
+        """
+        if connection.vendor != "sqlite":
+            self.skipTest("FTS5 triggers exist on SQLite only")
+        with connection.cursor() as cursor:
+            for name in search.SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER {name}")
+        self.in_content.content = "Nothing to see"
+        self.in_content.save()
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        res = self.client.get(NEWSPAPER_URL, {"q": "election"})
+        self.assertEqual(list(res.context["newspaper_list"]), [self.in_title])
+        self.assertEqual(search.ensure_sqlite_search_triggers(), [])
+
+    def test_search_paginates_by_cursor(self) -> None:
+        res = self.client.get(NEWSPAPER_URL, {"q": "election", "page_size": 1})
+        self.assertEqual(list(res.context["newspaper_list"]), [self.in_title])
+        res = self.client.get(
+            NEWSPAPER_URL,
+            {
+                "q": "election",
+                "page_size": 1,
+                "cursor": res.context["page_obj"].next_cursor,
+            },
+        )
+        self.assertEqual(list(res.context["newspaper_list"]), [self.in_content])
+
+
+class NewspaperQueryCountTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+        topic = Topic.objects.create(name="test_topic")
+        publishers = [
+            Redactor.objects.create(username=f"publisher_{index}") for index in range(3)
+        ]
+        for index in range(10):
+            newspaper = Newspaper.objects.create(
+                title=f"newspaper_{index}",
+                content="test_content",
+                published_date=timezone.now(),
+                topic=topic,
+            )
+            newspaper.publishers.set(publishers)
+
+    def count_queries(self, url, data=None) -> int:
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, data)
+        self.assertEqual(res.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count_does_not_depend_on_page_size(self) -> None:
+        """
+        Checks that publishers are loaded with a constant number of queries
+        no matter how many newspapers are on the page.
+        :return:
+        """
+        # Fill the shared caches (topics, archive counts) first.
+        self.count_queries(NEWSPAPER_URL)
+        small_page = self.count_queries(NEWSPAPER_URL, {"page_size": 2})
+        large_page = self.count_queries(NEWSPAPER_URL, {"page_size": 10})
+        self.assertEqual(small_page, large_page)
+
+    def test_detail_query_count_does_not_depend_on_publishers(self) -> None:
+        newspaper = Newspaper.objects.first()
+        url = reverse("newspapers:newspaper-detail", args=[newspaper.id])
+        # Fill the shared caches (session user, topics) first.
+        self.count_queries(NEWSPAPER_URL)
+        with_three = self.count_queries(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper.publishers.add(Redactor.objects.create(username="publisher_3"))
+        self.assertEqual(self.count_queries(url), with_three)
+
+    def test_publishers_load_only_rendered_columns(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(NEWSPAPER_URL)
+        publisher_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "newspapers_newspaper_publishers" in query["sql"]
+        ]
+        self.assertEqual(len(publisher_queries), 1)
+        self.assertNotIn("password", publisher_queries[0])
+
+    def test_list_renders_excerpt_without_loading_content(self) -> None:
+        """
+        Checks that the list page renders the stored excerpt and reading
+        time and never selects the article body.
+        :return:
+        """
+        Newspaper.objects.update(content="")
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(NEWSPAPER_URL)
+        newspaper = res.context["newspaper_list"][0]
+        self.assertIn("content", newspaper.get_deferred_fields())
+        self.assertContains(res, newspaper.excerpt)
+        self.assertContains(res, f"{newspaper.reading_time} min read")
+        for query in context.captured_queries:
+            self.assertNotIn('"newspapers_newspaper"."content"', query["sql"])
+
+
+class NewspaperArchiveViewTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+        self.topic = Topic.objects.create(name="test_topic")
+        for published_date in (
+            datetime.date(2023, 12, 24),
+            datetime.date(2024, 1, 5),
+            datetime.date(2024, 1, 20),
+            datetime.date(2024, 3, 1),
+        ):
+            Newspaper.objects.create(
+                title=f"newspaper_{published_date}",
+                content="test_content",
+                published_date=published_date,
+                topic=self.topic,
+            )
+
+    def test_month_counts_are_grouped_by_year(self) -> None:
+        """
+        Checks that the sidebar counts come from one grouped query and are
+        served from the cache afterwards.
+        :return:
+        """
+        with self.assertNumQueries(1):
+            years = archive.get_months_by_year()
+        self.assertEqual(
+            [(year, total) for year, months, total in years], [(2024, 3), (2023, 1)]
+        )
+        self.assertEqual(
+            [(entry["month"], entry["count"]) for entry in years[0][1]],
+            [(datetime.date(2024, 3, 1), 1), (datetime.date(2024, 1, 1), 2)],
+        )
+        with self.assertNumQueries(0):
+            archive.get_months_by_year()
+
+    def test_counts_are_invalidated_on_save_and_delete(self) -> None:
+        archive.get_month_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(
+                title="new",
+                content="test_content",
+                published_date=datetime.date(2024, 3, 2),
+                topic=self.topic,
+            )
+        self.assertEqual(archive.get_month_counts()[0]["count"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper.delete()
+        self.assertEqual(archive.get_month_counts()[0]["count"], 1)
+
+    def test_year_archive(self) -> None:
+        url = reverse("newspapers:newspaper-archive-year", kwargs={"year": 2024})
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertTemplateUsed(res, "newspapers/newspaper_archive_year.html")
+        self.assertEqual(
+            [newspaper.published_date for newspaper in res.context["newspaper_list"]],
+            [
+                datetime.date(2024, 3, 1),
+                datetime.date(2024, 1, 20),
+                datetime.date(2024, 1, 5),
+            ],
+        )
+        self.assertEqual(
+            res.context["date_list"],
+            [datetime.date(2024, 1, 1), datetime.date(2024, 3, 1)],
+        )
+        self.assertContains(
+            res,
+            reverse(
+                "newspapers:newspaper-archive-month", kwargs={"year": 2023, "month": 12}
+            ),
+        )
+
+    def test_month_archive(self) -> None:
+        url = reverse(
+            "newspapers:newspaper-archive-month", kwargs={"year": 2024, "month": 1}
+        )
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.context["newspaper_list"]), 2)
+
+    def test_empty_period_returns_404(self) -> None:
+        url = reverse("newspapers:newspaper-archive-year", kwargs={"year": 2020})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse(
+            "newspapers:newspaper-archive-month", kwargs={"year": 2024, "month": 2}
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_archive_is_paginated_by_cursor(self) -> None:
+        url = reverse("newspapers:newspaper-archive-year", kwargs={"year": 2024})
+        res = self.client.get(url, {"page_size": 2})
+        self.assertTrue(res.context["cursor_pagination"])
+        res = self.client.get(
+            url, {"page_size": 2, "cursor": res.context["page_obj"].next_cursor}
+        )
+        self.assertEqual(
+            [newspaper.published_date for newspaper in res.context["newspaper_list"]],
+            [datetime.date(2024, 1, 5)],
+        )
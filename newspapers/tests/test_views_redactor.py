@@ -1,8 +1,13 @@
+import datetime
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 
-from newspapers.models import Redactor
+from newspapers.models import Newspaper, Redactor, Topic
 
 TOPIC_URL = reverse("newspapers:topic-list")
 NEWSPAPER_URL = reverse("newspapers:newspaper-list")
@@ -121,6 +126,62 @@ class RedactorListViewTest(TestCase):
         )
         self.assertTemplateUsed(res, "newspapers/redactor_list.html")
 
+    def test_search_redactor_orders_by_similarity(self) -> None:
+        """
+        Checks that the closest username match is listed first.
+        :return:
+        """
+        Redactor.objects.create_user(username="anna_maria_smith")
+        Redactor.objects.create_user(username="smith")
+        Redactor.objects.create_user(username="smithson")
+        res = self.client.get(REDACTOR_URL, {"username": "SMITH"})
+        self.assertEqual(
+            [redactor.username for redactor in res.context["redactor_list"]],
+            ["smith", "smithson", "anna_maria_smith"],
+        )
+
+
+class RedactorAutocompleteViewTest(TestCase):
+    url = reverse("newspapers:redactor-autocomplete")
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user", password="test123"
+        )
+        for username in ("anna", "andrew", "bob"):
+            Redactor.objects.create(
+                username=username, first_name="First", last_name="Last"
+            )
+        self.client.force_login(self.user)
+
+    def test_login_required(self) -> None:
+        self.client.logout()
+        self.assertNotEqual(self.client.get(self.url, {"q": "an"}).status_code, 200)
+
+    def test_prefix_search(self) -> None:
+        """
+        Redactors whose username starts with the query are returned in
+        username order.
+        :return:
+        """
+        res = self.client.get(self.url, {"q": "an"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [result["text"] for result in res.json()["results"]],
+            ["andrew: (First Last)", "anna: (First Last)"],
+        )
+
+    def test_empty_query_returns_nothing(self) -> None:
+        res = self.client.get(self.url)
+        self.assertEqual(res.json(), {"results": []})
+
+    def test_results_are_limited(self) -> None:
+        Redactor.objects.bulk_create(
+            Redactor(username=f"many_{index:02}") for index in range(30)
+        )
+        res = self.client.get(self.url, {"q": "many_"})
+        self.assertEqual(len(res.json()["results"]), 20)
+
 
 class RedactorDetailViewTest(TestCase):
     def setUp(self) -> None:
@@ -128,6 +189,7 @@ class RedactorDetailViewTest(TestCase):
         Creates a user for testing and redactor to be accessed later.
         :return:
         """
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="test_user",
             password="test123",
@@ -153,6 +215,47 @@ class RedactorDetailViewTest(TestCase):
         self.assertEqual(res.context["redactor"], self.redactor)
         self.assertTemplateUsed(res, "newspapers/redactor_detail.html")
 
+    def test_newspapers_are_counted_and_paginated(self) -> None:
+        """
+        Checks that the page shows the total number of newspapers and the
+        latest ones first, without loading their content, and that the
+        cursor leads to the older ones.
+        :return:
+        """
+        topic = Topic.objects.create(name="test_topic")
+        for day in range(1, 13):
+            newspaper = Newspaper.objects.create(
+                title=f"newspaper_{day}",
+                content="long content",
+                published_date=datetime.date(2024, 1, day),
+                topic=topic,
+            )
+            newspaper.publishers.add(self.redactor)
+        url = reverse("newspapers:redactor-detail", args=[self.redactor.id])
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url)
+        self.assertEqual(res.context["redactor"].newspaper_count, 12)
+        self.assertContains(res, "Newspapers (12):")
+        titles = [newspaper.title for newspaper in res.context["newspaper_list"]]
+        self.assertEqual(titles, [f"newspaper_{day}" for day in range(12, 2, -1)])
+        newspaper_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "newspapers_newspaper"' in query["sql"]
+        ]
+        self.assertEqual(len(newspaper_queries), 1)
+        self.assertNotIn('"newspapers_newspaper"."content"', newspaper_queries[0])
+
+        res = self.client.get(url, {"cursor": res.context["page_obj"].next_cursor})
+        titles = [newspaper.title for newspaper in res.context["newspaper_list"]]
+        self.assertEqual(titles, ["newspaper_2", "newspaper_1"])
+        self.assertFalse(res.context["page_obj"].has_next())
+
+    def test_invalid_cursor_returns_404(self) -> None:
+        url = reverse("newspapers:redactor-detail", args=[self.redactor.id])
+        res = self.client.get(url, {"cursor": "broken"})
+        self.assertEqual(res.status_code, 404)
+
 
 class RedactorUpdateViewTest(TestCase):
     def setUp(self) -> None:
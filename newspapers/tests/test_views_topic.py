@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from newspapers.models import Topic
@@ -81,6 +81,17 @@ class TopicListViewTest(TestCase):
         )
         self.assertTemplateUsed(res, "newspapers/topic_list.html")
 
+    @override_settings(SUBSTRING_SEARCH_FALLBACK_LIMIT=2)
+    def test_search_topic_fallback_is_bounded(self) -> None:
+        """
+        We check that the SQLite fallback never returns more than the configured number of matches.
+        :return:
+        """
+        for name in ("sport", "sports news", "e-sports", "motorsport"):
+            Topic.objects.create(name=name)
+        res = self.client.get(TOPIC_URL, {"name": "sport", "page_size": 10})
+        self.assertEqual(len(res.context["topic_list"]), 2)
+
 
 class TopicUpdateViewTest(TestCase):
     def setUp(self) -> None:
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from newspapers import visits
+
+INDEX_URL = reverse("newspapers:index")
+
+
+@override_settings(VISIT_COUNTER_FLUSH_EVERY=3)
+class VisitCounterTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test123",
+        )
+        self.client.force_login(self.user)
+
+    def test_visits_are_counted_on_every_hit(self) -> None:
+        """
+        Checks that the displayed number of visits grows with every page view.
+        :return:
+        """
+        for expected in range(1, 6):
+            res = self.client.get(INDEX_URL)
+            self.assertEqual(res.context["num_visits"], expected)
+
+    def test_session_is_written_in_batches(self) -> None:
+        """
+        Checks that the session only stores the counter on every third visit.
+        :return:
+        """
+        self.client.get(INDEX_URL)
+        self.client.get(INDEX_URL)
+        self.assertNotIn("num_visits", self.client.session)
+        self.client.get(INDEX_URL)
+        self.assertEqual(self.client.session["num_visits"], 3)
+        self.client.get(INDEX_URL)
+        self.assertEqual(self.client.session["num_visits"], 3)
+
+    def test_concurrent_flush_does_not_double_count(self) -> None:
+        """
+        Checks that only the request holding the flush lock moves the pending
+        visits into the session.
+        :return:
+        """
+        self.client.get(INDEX_URL)
+        self.client.get(INDEX_URL)
+        key = visits.visit_cache_key(self.client.get(INDEX_URL).wsgi_request)
+        self.assertEqual(self.client.session["num_visits"], 3)
+        self.client.get(INDEX_URL)
+        self.client.get(INDEX_URL)
+        # Another request is flushing this batch.
+        cache.add(f"{key}:flush", 1)
+        res = self.client.get(INDEX_URL)
+        self.assertEqual(res.context["num_visits"], 6)
+        self.assertEqual(self.client.session["num_visits"], 3)
+        cache.delete(f"{key}:flush")
+        res = self.client.get(INDEX_URL)
+        self.assertEqual(res.context["num_visits"], 7)
+        self.assertEqual(self.client.session["num_visits"], 7)
+
+    def test_pending_visits_survive_login(self) -> None:
+        """
+        Checks that visits not yet flushed are kept when the session key is
+        rotated at login.
+        :return:
+        """
+        self.client.get(INDEX_URL)
+        self.client.get(INDEX_URL)
+        self.client.force_login(self.user)
+        self.client.get(INDEX_URL)
+        self.assertEqual(self.client.session["num_visits"], 3)
+
+    def test_sessions_of_one_user_count_separately(self) -> None:
+        """
+        Checks that two browsers of the same user keep their own counts.
+        :return:
+        """
+        other = Client()
+        other.force_login(self.user)
+        for expected in range(1, 6):
+            res = self.client.get(INDEX_URL)
+            self.assertEqual(res.context["num_visits"], expected)
+        self.assertEqual(other.get(INDEX_URL).context["num_visits"], 1)
+        self.assertEqual(self.client.get(INDEX_URL).context["num_visits"], 6)
+        self.assertEqual(other.get(INDEX_URL).context["num_visits"], 2)
@@ -2,7 +2,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.utils import timezone
 
-from newspapers.models import Topic, Newspaper
+from newspapers.models import EXCERPT_LENGTH, Topic, Newspaper
 
 
 class ModelTests(TestCase):
@@ -78,3 +78,38 @@ class ModelTests(TestCase):
         newspaper.publishers.add(redactor)
         expected_url = f"/newspapers/newspapers/{newspaper.id}/"
         self.assertEqual(newspaper.get_absolute_url(), expected_url)
+
+    def test_newspaper_summary_is_maintained_on_save(self):
+        topic = Topic.objects.create(name="test")
+        newspaper = Newspaper.objects.create(
+            title="test",
+            content="word  " * 450,
+            published_date=timezone.now(),
+            topic=topic,
+        )
+        self.assertEqual(newspaper.word_count, 450)
+        self.assertEqual(newspaper.reading_time, 3)
+        self.assertEqual(len(newspaper.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(newspaper.excerpt.startswith("word word"))
+        self.assertTrue(newspaper.excerpt.endswith("…"))
+
+        newspaper.content = "Short story"
+        newspaper.save(update_fields=["content"])
+        newspaper.refresh_from_db()
+        self.assertEqual(newspaper.excerpt, "Short story")
+        self.assertEqual(newspaper.word_count, 2)
+        self.assertEqual(newspaper.reading_time, 1)
+
+    def test_newspaper_save_with_deferred_content(self):
+        topic = Topic.objects.create(name="test")
+        Newspaper.objects.create(
+            title="test",
+            content="Short story",
+            published_date=timezone.now(),
+            topic=topic,
+        )
+        newspaper = Newspaper.objects.defer("content").get()
+        newspaper.title = "renamed"
+        with self.assertNumQueries(1):
+            newspaper.save()
+        self.assertEqual(Newspaper.objects.get().excerpt, "Short story")
@@ -0,0 +1,115 @@
+"""
+Registry of all topics (id -> name, choices ordered by name).
+
+Topics are few and rarely change, so forms and newspaper lists read them
+from here instead of querying or joining ``newspapers_topic``. The registry
+is held in process and in the shared cache under a version token; saving
+or deleting a topic replaces the token, which every worker compares on
+access before trusting its in-process copy.
+"""
+
+import threading
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_CACHE_KEY = "newspapers:topics:version"
+REGISTRY_CACHE_KEY = "newspapers:topics:{version}"
+DEFAULT_CACHE_TIMEOUT = 24 * 60 * 60
+
+_local = {"version": None, "registry": None}
+_lock = threading.Lock()
+
+
+class TopicRegistry:
+    def __init__(self, choices):
+        self.choices = choices
+        self.names = dict(choices)
+
+    def __contains__(self, pk):
+        return pk in self.names
+
+    def __len__(self):
+        return len(self.choices)
+
+    def get(self, pk, using="default"):
+        """
+        ``Topic`` for ``pk`` built without a query, or ``None``
+        """
+        if pk not in self.names:
+            return None
+        Topic = apps.get_model("newspapers", "Topic")
+        topic = Topic(id=pk, name=self.names[pk])
+        topic._state.adding = False
+        topic._state.db = using
+        return topic
+
+
+def _timeout():
+    return getattr(settings, "TOPIC_REGISTRY_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def _current_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # Another worker may add it first; whichever token won is used.
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, _timeout())
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def _load_choices():
+    Topic = apps.get_model("newspapers", "Topic")
+    return list(Topic.objects.order_by("name", "id").values_list("id", "name"))
+
+
+def get_registry():
+    """
+    The current ``TopicRegistry``; costs one cache read of the version
+    token while nothing changed
+    """
+    version = _current_version()
+    with _lock:
+        if version is not None and _local["version"] == version:
+            return _local["registry"]
+    key = REGISTRY_CACHE_KEY.format(version=version)
+    choices = cache.get(key) if version is not None else None
+    if choices is None:
+        choices = _load_choices()
+        if version is not None:
+            cache.set(key, choices, _timeout())
+    registry = TopicRegistry(choices)
+    with _lock:
+        _local["version"] = version
+        _local["registry"] = registry
+    return registry
+
+
+def attach(newspapers):
+    """
+    Set ``topic`` on ``newspapers`` from the registry so rendering it needs
+    neither a join nor a query per row
+    """
+    registry = get_registry()
+    Newspaper = apps.get_model("newspapers", "Newspaper")
+    field = Newspaper._meta.get_field("topic")
+    for newspaper in newspapers:
+        if field.is_cached(newspaper):
+            continue
+        if newspaper.topic_id is None:
+            field.set_cached_value(newspaper, None)
+        elif newspaper.topic_id in registry:
+            field.set_cached_value(
+                newspaper, registry.get(newspaper.topic_id, newspaper._state.db)
+            )
+        # A topic missing from the registry is loaded lazily as usual.
+    return newspapers
+
+
+def invalidate():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, _timeout())
+    with _lock:
+        _local["version"] = None
+        _local["registry"] = None
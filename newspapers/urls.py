@@ -7,10 +7,14 @@ from newspapers.views import (
     TopicUpdateView,
     TopicDeleteView,
     NewspaperListView,
+    NewspaperExportView,
+    NewspaperYearArchiveView,
+    NewspaperMonthArchiveView,
     NewspaperDetailView,
     NewspaperCreateView,
     NewspaperUpdateView,
     NewspaperDeleteView,
+    RedactorAutocompleteView,
     RedactorListView,
     RedactorDetailView,
     RedactorCreateView,
@@ -28,6 +32,17 @@ urlpatterns = [
     path("topics/<int:pk>/update/", TopicUpdateView.as_view(), name="topic-update"),
     path("topics/<int:pk>/delete/", TopicDeleteView.as_view(), name="topic-delete"),
     path("newspapers/", NewspaperListView.as_view(), name="newspaper-list"),
+    path("newspapers/export/", NewspaperExportView.as_view(), name="newspaper-export"),
+    path(
+        "newspapers/archive/<int:year>/",
+        NewspaperYearArchiveView.as_view(),
+        name="newspaper-archive-year",
+    ),
+    path(
+        "newspapers/archive/<int:year>/<int:month>/",
+        NewspaperMonthArchiveView.as_view(),
+        name="newspaper-archive-month",
+    ),
     path(
         "newspapers/<int:pk>/", NewspaperDetailView.as_view(), name="newspaper-detail"
     ),
@@ -43,6 +58,11 @@ urlpatterns = [
         name="newspaper-delete",
     ),
     path("redactors/", RedactorListView.as_view(), name="redactor-list"),
+    path(
+        "redactors/autocomplete/",
+        RedactorAutocompleteView.as_view(),
+        name="redactor-autocomplete",
+    ),
     path("redactors/<int:pk>/", RedactorDetailView.as_view(), name="redactor-detail"),
     path("redactors/create/", RedactorCreateView.as_view(), name="redactor-create"),
     path(
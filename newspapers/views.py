@@ -1,37 +1,47 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views import generic
 
+from newspapers import archive, counters, exports, object_cache, topics, visits
 from newspapers.forms import (
     RedactorCreationForm,
     RedactorSearchForm,
     NewspaperForm,
     NewspaperSearchForm,
     TopicSearchForm,
+    PUBLISHER_FIELDS,
 )
 from newspapers.models import Redactor, Newspaper, Topic
+from newspapers.pagination import (
+    CursorPaginationMixin,
+    CursorPaginator,
+    InvalidCursor,
+)
+from newspapers.search import search_prefix
 
 
 @login_required
 def index(request):
     """View function for home page of the site."""
 
-    num_visits = request.session.get("num_visits", 0)
-    request.session["num_visits"] = num_visits + 1
+    num_visits = visits.record_visit(request)
 
+    counts = counters.get_counts()
     context = {
-        "num_topics": Topic.objects.count(),
-        "num_redactors": Redactor.objects.count(),
-        "num_newspapers": Newspaper.objects.count(),
-        "num_visits": num_visits + 1,
+        "num_topics": counts[Topic],
+        "num_redactors": counts[Redactor],
+        "num_newspapers": counts[Newspaper],
+        "num_visits": num_visits,
     }
 
     return render(request, "newspapers/index.html", context=context)
 
 
-class TopicListView(LoginRequiredMixin, generic.ListView):
+class TopicListView(LoginRequiredMixin, CursorPaginationMixin, generic.ListView):
     model = Topic
     paginate_by = 3
 
@@ -46,7 +56,7 @@ class TopicListView(LoginRequiredMixin, generic.ListView):
         queryset = Topic.objects.all().order_by("name")
         form = TopicSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return form.get_queryset(queryset)
         return queryset
 
 
@@ -70,28 +80,111 @@ class TopicDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "newspapers/topic_delete.html"
 
 
-class NewspaperListView(LoginRequiredMixin, generic.ListView):
+class NewspaperListView(LoginRequiredMixin, CursorPaginationMixin, generic.ListView):
     model = Newspaper
     paginate_by = 3
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(NewspaperListView, self).get_context_data(**kwargs)
         topic = self.request.GET.get("topic", "")
-        context["search_form"] = NewspaperSearchForm(initial={"topic": topic})
-        context["search_query"] = topic
+        text = self.request.GET.get("q", "")
+        context["search_form"] = NewspaperSearchForm(
+            initial={"topic": topic, "q": text}
+        )
+        context["search_query"] = text or topic
+        context["archive_years"] = archive.get_months_by_year()
+        topics.attach(context["object_list"])
         return context
 
     def get_queryset(self):
-        queryset = Newspaper.objects.select_related("topic")
+        # Topics come from the registry, see get_context_data().
+        queryset = Newspaper.objects.defer("content").prefetch_related(
+            Prefetch(
+                "publishers",
+                queryset=Redactor.objects.only("id", "first_name", "last_name"),
+            )
+        )
         form = NewspaperSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(topic__name__icontains=form.cleaned_data["topic"])
+            return form.get_queryset(queryset)
         return queryset
 
 
+class NewspaperArchiveMixin(LoginRequiredMixin, CursorPaginationMixin):
+    """
+    Newspapers of one period by ``published_date`` with the per-month counts
+    sidebar
+    """
+
+    model = Newspaper
+    date_field = "published_date"
+    month_format = "%m"
+    make_object_list = True
+    paginate_by = 20
+    cursor_ordering = ("-published_date", "-id")
+
+    def get_queryset(self):
+        return Newspaper.objects.defer("content").prefetch_related(
+            Prefetch(
+                "publishers",
+                queryset=Redactor.objects.only("id", "first_name", "last_name"),
+            )
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["archive_years"] = archive.get_months_by_year()
+        topics.attach(context["object_list"])
+        return context
+
+
+class NewspaperYearArchiveView(NewspaperArchiveMixin, generic.YearArchiveView):
+    def get_date_list(self, queryset, date_type=None, ordering="ASC"):
+        # The months of the year come from the cached counts, not a query.
+        year = int(self.get_year())
+        months = [
+            entry["month"]
+            for entry in reversed(archive.get_month_counts())
+            if entry["month"].year == year
+        ]
+        if not months and not self.get_allow_empty():
+            raise Http404(f"No newspapers available for {year}")
+        return months
+
+
+class NewspaperMonthArchiveView(NewspaperArchiveMixin, generic.MonthArchiveView):
+    pass
+
+
+class NewspaperExportView(LoginRequiredMixin, generic.View):
+    """
+    Stream the newspapers matching the list filters as CSV or NDJSON
+    """
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in exports.EXPORT_FORMATS:
+            raise Http404("Unknown export format")
+        queryset = exports.export_queryset(request.GET)
+        response = StreamingHttpResponse(
+            exports.iter_export(queryset, export_format),
+            content_type=exports.EXPORT_FORMATS[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="newspapers.{export_format}"'
+        )
+        return response
+
+
 class NewspaperDetailView(LoginRequiredMixin, generic.DetailView):
     model = Newspaper
 
+    def get_object(self, queryset=None):
+        try:
+            return object_cache.get_newspaper(self.kwargs[self.pk_url_kwarg])
+        except Newspaper.DoesNotExist:
+            raise Http404("No newspaper found matching the query")
+
 
 class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
     model = Newspaper
@@ -102,6 +195,10 @@ class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
 class NewspaperUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Newspaper
     form_class = NewspaperForm
+    # The form only needs publisher ids, its widget loads the labels.
+    queryset = Newspaper.objects.prefetch_related(
+        Prefetch("publishers", queryset=Redactor.objects.only("id"))
+    )
 
 
 class NewspaperDeleteView(LoginRequiredMixin, generic.DeleteView):
@@ -110,7 +207,26 @@ class NewspaperDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "newspapers/newspaper_confirm_delete.html"
 
 
-class RedactorListView(LoginRequiredMixin, generic.ListView):
+class RedactorAutocompleteView(LoginRequiredMixin, generic.View):
+    """
+    Redactors whose username starts with ``q`` as ``{"results": [{"id", "text"}]}``
+    for the publishers autocomplete
+    """
+
+    limit = 20
+
+    def get(self, request, *args, **kwargs):
+        queryset = search_prefix(
+            Redactor.objects.only(*PUBLISHER_FIELDS), "username", request.GET.get("q")
+        )
+        results = [
+            {"id": redactor.pk, "text": str(redactor)}
+            for redactor in queryset[: self.limit]
+        ]
+        return JsonResponse({"results": results})
+
+
+class RedactorListView(LoginRequiredMixin, CursorPaginationMixin, generic.ListView):
     model = Redactor
     paginate_by = 3
 
@@ -125,13 +241,47 @@ class RedactorListView(LoginRequiredMixin, generic.ListView):
         queryset = Redactor.objects.all().order_by("username")
         form = RedactorSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(username__icontains=form.cleaned_data["username"])
+            return form.get_queryset(queryset)
         return queryset
 
 
 class RedactorDetailView(LoginRequiredMixin, generic.DetailView):
+    """
+    Redactor profile with the total number of newspapers and a cursor
+    paginated list of them, newest first
+    """
+
     model = Redactor
-    queryset = Redactor.objects.prefetch_related("newspapers")
+    newspapers_paginate_by = 10
+    cursor_kwarg = "cursor"
+
+    def get_object(self, queryset=None):
+        try:
+            return object_cache.get_redactor(self.kwargs[self.pk_url_kwarg])
+        except Redactor.DoesNotExist:
+            raise Http404("No redactor found matching the query")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        newspapers = self.object.newspapers.defer("content")
+        paginator = CursorPaginator(
+            newspapers,
+            self.newspapers_paginate_by,
+            ordering=("-published_date", "-id"),
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor")
+        context.update(
+            {
+                "newspaper_list": topics.attach(page.object_list),
+                "page_obj": page,
+                "is_paginated": page.has_other_pages(),
+                "cursor_pagination": True,
+            }
+        )
+        return context
 
 
 class RedactorCreateView(LoginRequiredMixin, generic.CreateView):
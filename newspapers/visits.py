@@ -0,0 +1,77 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+SESSION_KEY = "num_visits"
+COUNTER_SESSION_KEY = "num_visits_counter"
+CACHE_KEY = "newspapers:visits:{}"
+FLUSH_LOCK_TIMEOUT = 10
+
+
+def visit_cache_key(request):
+    """
+    Key of the session's pending visit counter. It is named by a token kept
+    in the session data, which survives the key rotation at login, while
+    every other session of the same user counts on its own.
+    """
+    token = request.session.get(COUNTER_SESSION_KEY)
+    if token is None:
+        token = uuid.uuid4().hex
+        request.session[COUNTER_SESSION_KEY] = token
+    return CACHE_KEY.format(token)
+
+
+def _flush(request, key):
+    """
+    Move the pending visits of ``key`` into the session and return the new
+    total, or ``None`` if another request is already flushing them
+    """
+    lock_key = f"{key}:flush"
+    if not cache.add(lock_key, 1, FLUSH_LOCK_TIMEOUT):
+        return None
+    try:
+        session = request.session
+        # Read what the store holds now, another request may have flushed
+        # since this one loaded its session.
+        stored = session.load().get(SESSION_KEY, 0)
+        pending = cache.get(key, 0)
+        session[SESSION_KEY] = stored + pending
+        # Saved before the batch is released so the next flush reads it.
+        session.save()
+        session.modified = False
+        cache.decr(key, pending)
+        return stored + pending
+    finally:
+        cache.delete(lock_key)
+
+
+def record_visit(request):
+    """
+    Count a home page visit and return the total number of visits.
+
+    Increments accumulate in the cache and are flushed into the session only
+    every ``VISIT_COUNTER_FLUSH_EVERY`` visits, so most page views do not
+    modify (and therefore do not save) the session.
+    """
+    session = request.session
+    stored = session.get(SESSION_KEY, 0)
+    if session.session_key is None:
+        session[SESSION_KEY] = stored + 1
+        return stored + 1
+
+    flush_every = getattr(settings, "VISIT_COUNTER_FLUSH_EVERY", 10)
+    key = visit_cache_key(request)
+    cache.add(key, 0, timeout=settings.SESSION_COOKIE_AGE)
+    try:
+        pending = cache.incr(key)
+    except ValueError:
+        # The entry expired between add() and incr(): count the visit directly.
+        session[SESSION_KEY] = stored + 1
+        return stored + 1
+
+    if pending >= flush_every:
+        total = _flush(request, key)
+        if total is not None:
+            return total
+    return stored + pending
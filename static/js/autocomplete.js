@@ -0,0 +1,40 @@
+// Multiple selects with a data-autocomplete-url only render their selected
+// options; everything else is searched on the server as the user types.
+document.addEventListener("DOMContentLoaded", function () {
+  document.querySelectorAll("select[data-autocomplete-url]").forEach(function (select) {
+    var url = select.dataset.autocompleteUrl;
+    var choices = new Choices(select, {
+      removeItemButton: true,
+      searchChoices: false,
+      shouldSort: false,
+      placeholderValue: "Search by username",
+      noChoicesText: "Type to search",
+    });
+    var timer = null;
+    var controller = null;
+
+    select.addEventListener("search", function (event) {
+      var query = event.detail.value.trim();
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        if (controller) {
+          controller.abort();
+        }
+        controller = new AbortController();
+        fetch(url + "?q=" + encodeURIComponent(query), {
+          credentials: "same-origin",
+          signal: controller.signal,
+        })
+          .then(function (response) { return response.json(); })
+          .then(function (data) {
+            choices.setChoices(data.results, "id", "text", true);
+          })
+          .catch(function (error) {
+            if (error.name !== "AbortError") {
+              throw error;
+            }
+          });
+      }, 250);
+    });
+  });
+});